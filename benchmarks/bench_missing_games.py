@@ -0,0 +1,51 @@
+import copy
+import os
+import timeit
+
+from src.compute_missing_games import compute_missing_games
+from unit_tests.missing_games_reference import legacy_compute_missing_games, make_round_robin_season
+
+# Times rebuilding games from the differences between every consecutive pair of league tables in a season, comparing
+# the hash-map matching engine with the previous iterrows/boolean-mask implementation, and checks both produce the
+# same games. Seasons come from the post cache when data/pages exists, otherwise a synthetic 20 team double round
+# robin is used. Run from the repository root with:
+#   python -m benchmarks.bench_missing_games
+
+
+def load_seasons(page_dir="data/pages"):
+    from src.post_cache import get_page_filepaths, load_records
+    seasons = {}
+    for _, records in load_records(get_page_filepaths(page_dir)):
+        for record in records:
+            if not record.is_unneeded_post and record.table is not None and "P" in record.table:
+                seasons.setdefault(record.season, []).append(record)
+    return seasons
+
+
+def main(repeat=3):
+    seasons = load_seasons() if os.path.isdir("data/pages") else {"synthetic": make_round_robin_season()}
+    total_legacy = total_new = 0
+    n_timed = 0
+    for season, posts in sorted(seasons.items()):
+        try:
+            legacy = legacy_compute_missing_games(copy.deepcopy(posts))
+        except (ValueError, KeyError, TypeError):
+            print(f"{season}: tables can't be diffed, skipping")
+            continue
+        new = compute_missing_games(copy.deepcopy(posts)).drop(columns=["post_id", "game_index"], errors="ignore")
+        legacy_seconds = min(timeit.repeat(lambda: legacy_compute_missing_games(copy.deepcopy(posts)), number=1,
+                                           repeat=repeat))
+        new_seconds = min(timeit.repeat(lambda: compute_missing_games(copy.deepcopy(posts)), number=1,
+                                        repeat=repeat))
+        total_legacy += legacy_seconds
+        total_new += new_seconds
+        n_timed += 1
+        same = legacy.reset_index(drop=True).astype(str).equals(new.reset_index(drop=True).astype(str))
+        print(f"{season}: {len(posts)} tables, {len(new)} games, legacy {legacy_seconds * 1e3:.1f} ms, "
+              f"new {new_seconds * 1e3:.1f} ms, same games: {same}")
+    if n_timed > 1:
+        print(f"all {n_timed} seasons: legacy {total_legacy * 1e3:.1f} ms, new {total_new * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
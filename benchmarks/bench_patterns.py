@@ -0,0 +1,83 @@
+import logging
+import random
+import re
+import timeit
+
+from src import patterns
+from src.game import Game
+
+# Times extracting games and scorers per game with the precompiled pattern registry against the previous approach of
+# passing raw pattern strings to re on every call. Run from the repository root with:
+#   python -m benchmarks.bench_patterns
+
+TEAMS = ["Drink Team", "Hanoi Capitals", "Roots FC", "FC Thống Nhất", "Minsk", "Brothers", "HSS", "Nguyễn Trãi FC",
+         "Red Star", "X-men", "Hanoi Dragons", "FPT", "Vietnam Veterans", "St. Paul's", "Hanoi Bohemians",
+         "Ha Noi United", "Bia Hoi FC", "Legends", "Old Quarter", "Tay Ho Rovers"]
+
+
+def make_goals_strs(n_games):
+    random.seed(0)
+    games = []
+    for _ in range(n_games):
+        home_team, away_team = random.sample(TEAMS, 2)
+        games.append((home_team, away_team,
+                      f"Goals: {home_team}: Jo x 2, Frazier, Joey (10, 20); {away_team}: Adam, ?"))
+    return games
+
+
+def legacy_get_scorer_matches(home_team, away_team, goals_str):
+    regex_patterns = [f"Goals: ({home_team}):?([^;]*);? ?(?:({away_team}):?(.*))",
+                      r"Goals: (.*):(.*);( (.*):(.*).)?",
+                      r"Goals: (.*):(.*)\.(.*)(.*)(.*)",
+                      r"Goals: (.*):(.*)(.*)(.*)(.*)",
+                      f"Goals: ({home_team})(.*)(({away_team})(.*))"]
+    for reg in regex_patterns:
+        found = re.findall(reg, goals_str)
+        if found:
+            return found
+
+
+def registry_get_scorer_matches(home_team, away_team, goals_str):
+    for reg in patterns.get_scorer_patterns(home_team, away_team):
+        found = reg.findall(goals_str)
+        if found:
+            return found
+
+
+def legacy_find_games_in_text(html_text):
+    games1 = re.findall(r"(?: *\d. *)?((.*?) ([\d]{1,2}) {0,2}[–-] {0,2}([\d]{1,2}).? (.+?)(?:$|\()(?:(.+)\))?)",
+                        html_text, re.MULTILINE)
+    games2 = re.findall(r"(?: *\d. *)?((.*?) ([\d]{1,2}) ?[–-] ?(.+?) ([\d]{1,2}))(?: *\n)", html_text)
+    return games1, games2
+
+
+def registry_find_games_in_text(html_text):
+    return patterns.GAME.findall(html_text), patterns.GAME_SCORE_AFTER_TEAM.findall(html_text)
+
+
+def main(n_games=2000, repeat=5):
+    # Unaccounted goal warnings from the synthetic goals strings would drown out the timings
+    logging.disable(logging.WARNING)
+    games = make_goals_strs(n_games)
+    game_lines = [f"{h} {random.randint(0, 5)}-{random.randint(0, 5)} {a}" for h, a, _ in games]
+    for name, func in [("legacy scorers", legacy_get_scorer_matches),
+                       ("registry scorers", registry_get_scorer_matches)]:
+        seconds = min(timeit.repeat(lambda: [func(*g) for g in games], number=1, repeat=repeat))
+        print(f"{name:>20}: {seconds / n_games * 1e6:.2f} us/game")
+    for name, func in [("legacy games", legacy_find_games_in_text),
+                       ("registry games", registry_find_games_in_text)]:
+        seconds = min(timeit.repeat(lambda: [func(line) for line in game_lines], number=1, repeat=repeat))
+        print(f"{name:>20}: {seconds / n_games * 1e6:.2f} us/game")
+    game = Game()
+    game.home_score, game.away_score = 4, 1
+
+    def get_all_scorers():
+        for home_team, away_team, goals_str in games:
+            game.home_team, game.away_team, game.goals_str = home_team, away_team, goals_str
+            game.get_all_scorers()
+    seconds = min(timeit.repeat(get_all_scorers, number=1, repeat=repeat))
+    print(f"{'Game.get_all_scorers':>20}: {seconds / n_games * 1e6:.2f} us/game")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import random
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from src.post_cache import GameRecord, PostRecord, get_game_columns
+
+# Compares the memory held by parsed posts and the peak while building the games DataFrame from them, for the
+# previous dict per game representation and the GameRecord/column building one, and checks both give the same games.
+# Uses a synthetic archive of 600 posts with 8 games each. Run from the repository root with:
+#   python -m benchmarks.bench_records
+
+
+def make_synthetic_games(n_posts=600, games_per_post=8, n_teams=20, seed=0):
+    random.seed(seed)
+    teams = [f"Team {i} FC" for i in range(n_teams)]
+    posts = []
+    for p in range(n_posts):
+        date = datetime(2010, 9, 1) + timedelta(days=7 * p)
+        season = f"{date.year}/{str(date.year + 1)[2:]}"
+        games = [random.sample(teams, 2) + [random.randint(0, 5), random.randint(0, 5)]
+                 for _ in range(games_per_post)]
+        posts.append((f"data/pages/page{p // 10}.html", str(10 ** 18 + p), f"Week {p}", date, season, games))
+    return posts
+
+
+def legacy_records(posts):
+    return [[{"home_team": home_team, "away_team": away_team, "home_score": home_score, "away_score": away_score,
+              "filepath": filepath, "post_title": title, "date": date, "season": season, "competition": "league",
+              "post_id": post_id, "game_index": i} for i, (home_team, away_team, home_score, away_score)
+             in enumerate(games)] for filepath, post_id, title, date, season, games in posts]
+
+
+def legacy_frame(records):
+    return pd.DataFrame([g for games in records for g in games])
+
+
+def new_records(posts):
+    return [PostRecord(filepath, post_id, title, date, season, None, None,
+                       tuple(GameRecord(home_team, away_team, home_score, away_score, date, season, "league")
+                             for home_team, away_team, home_score, away_score in games), False)
+            for filepath, post_id, title, date, season, games in posts]
+
+
+def new_frame(records):
+    return pd.DataFrame(get_game_columns(records))
+
+
+def measure(make_records, make_frame, posts):
+    # (bytes held by the records, peak bytes while building the frame from them)
+    tracemalloc.start()
+    records = make_records(posts)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    make_frame(records)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return held, peak
+
+
+def main(repeat=5):
+    posts = make_synthetic_games()
+    legacy = legacy_frame(legacy_records(posts))
+    new = new_frame(new_records(posts))
+    legacy_held, legacy_peak = measure(legacy_records, legacy_frame, posts)
+    new_held, new_peak = measure(new_records, new_frame, posts)
+    legacy_records_ = legacy_records(posts)
+    new_records_ = new_records(posts)
+    legacy_seconds = min(timeit.repeat(lambda: legacy_frame(legacy_records_), number=1, repeat=repeat))
+    new_seconds = min(timeit.repeat(lambda: new_frame(new_records_), number=1, repeat=repeat))
+    print(f"{len(posts)} posts, {len(legacy)} games")
+    print(f"legacy: records {legacy_held / 2 ** 20:.2f} MiB, peak {legacy_peak / 2 ** 20:.2f} MiB, "
+          f"frame {legacy_seconds * 1e3:.1f} ms")
+    print(f"new: records {new_held / 2 ** 20:.2f} MiB, peak {new_peak / 2 ** 20:.2f} MiB, "
+          f"frame {new_seconds * 1e3:.1f} ms")
+    print(f"same games: {legacy.equals(new)}")
+
+
+if __name__ == "__main__":
+    main()
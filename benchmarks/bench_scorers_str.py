@@ -0,0 +1,48 @@
+import random
+import timeit
+
+from src.blog_post import BlogPost
+
+# Times associating goals lines with games on a synthetic 500 game results post, comparing the single pass over the
+# lines with the previous lines x games scan. Run from the repository root with:
+#   python -m benchmarks.bench_scorers_str
+
+TEAMS = ["Drink Team", "Hanoi Capitals", "Roots FC", "FC Thống Nhất", "Minsk", "Brothers", "HSS", "Nguyễn Trãi FC"]
+
+
+def make_post(n_games):
+    random.seed(0)
+    games = []
+    lines = []
+    for _ in range(n_games):
+        home_team, away_team = random.sample(TEAMS, 2)
+        game_str = f"{home_team} {random.randint(0, 5)}-{random.randint(0, 5)} {away_team}"
+        games.append([game_str, home_team, "0", "0", away_team, ""])
+        lines.append(game_str)
+        lines.append(f"Goals: {home_team}: Jo x 2, Frazier;")
+        lines.append(f"{away_team}: Adam")
+    return games, "\n".join(lines)
+
+
+def legacy_get_scorers_str(games, html_text):
+    lines = html_text.splitlines()
+    for i in range(len(lines)):
+        for j in range(len(games)):
+            if lines[i] == games[j][0]:
+                if lines[i + 1].startswith("Goals: "):
+                    if lines[i + 1].endswith((";", ",")):
+                        games[j].append(lines[i + 1] + " " + lines[i + 2])
+                    else:
+                        games[j].append(lines[i + 1])
+    return games
+
+
+def main(n_games=500, repeat=5):
+    games, html_text = make_post(n_games)
+    for name, func in [("lines x games", legacy_get_scorers_str), ("single pass", BlogPost._get_scorers_str)]:
+        seconds = min(timeit.repeat(lambda: func([list(g) for g in games], html_text), number=1, repeat=repeat))
+        print(f"{name:>14}: {seconds * 1e3:.2f} ms for a {n_games} game post")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import random
+import timeit
+
+import pandas as pd
+
+from src.season import apply_team_aliases
+
+# Times renaming the team strings in a season's games to the names in its final table, comparing the single alias
+# lookup with the previous per-team DataFrame.apply, and checks both give the same games. Uses a synthetic season of
+# 20 teams and 400 games where each team is written a few different ways. Run from the repository root with:
+#   python -m benchmarks.bench_team_aliases
+
+
+def legacy_rename(games, team_pseudonyms):
+    def replace_multiple_substrings(row, targets, replacement):
+        result = row
+        for t in targets:
+            result = result.replace(t, replacement)
+        return result
+
+    games = games.copy()
+    for k, v in team_pseudonyms.items():
+        games[['home_team', 'away_team']] = \
+            games[['home_team', 'away_team']].apply(lambda x: replace_multiple_substrings(x, v, k))
+    return games
+
+
+def make_synthetic_season(n_teams=20, n_games=400, seed=0):
+    random.seed(seed)
+    team_pseudonyms = {f"Team {i} FC": [f"Team {i} FC", f"Team {i}", f"team {i} F.C.", f"Team-{i}"]
+                       for i in range(n_teams)}
+    teams = list(team_pseudonyms)
+    games = []
+    for _ in range(n_games):
+        home_team, away_team = random.sample(teams, 2)
+        games.append({"home_team": random.choice(team_pseudonyms[home_team]),
+                      "away_team": random.choice(team_pseudonyms[away_team]),
+                      "home_score": random.randint(0, 5), "away_score": random.randint(0, 5)})
+    team_aliases = {alias: k for k, v in team_pseudonyms.items() for alias in v}
+    return pd.DataFrame(games), team_pseudonyms, team_aliases
+
+
+def main(repeat=5):
+    games, team_pseudonyms, team_aliases = make_synthetic_season()
+    legacy = legacy_rename(games, team_pseudonyms)
+    new = apply_team_aliases(games, team_aliases)
+    legacy_seconds = min(timeit.repeat(lambda: legacy_rename(games, team_pseudonyms), number=1, repeat=repeat))
+    new_seconds = min(timeit.repeat(lambda: apply_team_aliases(games, team_aliases), number=1, repeat=repeat))
+    print(f"{len(team_pseudonyms)} teams, {len(games)} games: legacy {legacy_seconds * 1e3:.1f} ms, "
+          f"new {new_seconds * 1e3:.2f} ms, same games: {legacy.equals(new)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Responses worth trying again, anything else is returned or raised straight away
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncFetcher:
+    # Fetches many URLs at once, at most `concurrency` at a time and at most `rate_per_host` requests a second to any
+    # one host, and hands each body to `parse` as soon as it arrives so parsing overlaps the remaining downloads.
+    # requests does the fetching in threads, so no async HTTP library is needed
+
+    def __init__(self, concurrency=8, rate_per_host=4.0, retries=3, backoff=0.5, timeout=30, session=None):
+        self.concurrency = concurrency
+        self.min_interval = 1 / rate_per_host if rate_per_host else 0
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def fetch_all(self, urls, parse, workers=1, initializer=None, initargs=()):
+        # Returns parse(url, content) for each URL, in the order of urls. With more than one worker, parse runs in a
+        # process pool and must be picklable, as must what it returns
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+                return asyncio.run(self._fetch_all(urls, parse, executor))
+        return asyncio.run(self._fetch_all(urls, parse, None))
+
+    async def _fetch_all(self, urls, parse, executor):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        host_locks = defaultdict(asyncio.Lock)
+        next_request_times = defaultdict(float)
+
+        async def fetch_and_parse(url):
+            content = await self._fetch(url, semaphore, host_locks, next_request_times)
+            return await asyncio.get_running_loop().run_in_executor(executor, parse, url, content)
+
+        return await asyncio.gather(*[fetch_and_parse(url) for url in urls])
+
+    async def _fetch(self, url, semaphore, host_locks, next_request_times):
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                # Requests to the same host are spaced out, the lock makes waiting requests take turns
+                async with host_locks[host]:
+                    wait = next_request_times[host] - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    next_request_times[host] = time.monotonic() + self.min_interval
+                try:
+                    r = await asyncio.to_thread(self.session.get, url, timeout=self.timeout)
+                    if r.status_code not in RETRY_STATUSES:
+                        r.raise_for_status()
+                        return r.content
+                    error = requests.HTTPError(f"{r.status_code} for {url}", response=r)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+            if attempt == self.retries:
+                raise error
+            delay = self.backoff * 2 ** attempt
+            logger.warning(f"Fetching {url} failed ({error}), trying again in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -1,12 +1,10 @@
 import logging
-import urllib.error
-import urllib.parse
-import urllib.request
-from pathlib import Path
 
 import requests
 from bs4 import BeautifulSoup
 
+from src.downloader import PageDownloader
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,15 +29,12 @@ class Blog:
 
         return page_urls
 
-    def save_all_pages(self):
-        Path("data/pages").mkdir(parents=True, exist_ok=True)
-
-        urls = self.get_all_page_urls()
-        for i in range(len(urls)):
-            logger.debug(f"Downloading {urls[i]}")
-            response = urllib.request.urlopen(urls[i])
-            webContent = response.read()
+    @staticmethod
+    def get_older_link(url):
+        soup = BeautifulSoup(requests.get(url).content, 'html.parser')
+        older_posts_link = soup.find("a", class_="blog-pager-older-link")
+        return older_posts_link.get("href") if older_posts_link else None
 
-            f = open(f"data/pages/page{i}.html", 'wb')
-            f.write(webContent)
-            f.close()
\ No newline at end of file
+    def save_all_pages(self, refresh=False):
+        # Pages are saved as the older links are followed, so each one is only downloaded once
+        return PageDownloader(self.url, "data/pages").crawl(refresh)
@@ -1,17 +1,57 @@
 import logging
-import re
+from collections import defaultdict, deque
 from word2number import w2n
 import pandas as pd
 import html2text
 import os
 import numpy as np
-import requests
+import time
 
+from src import patterns, sheets
 from src.game import Game
+from src.post_classifier import SKIP, load_classifier
 
 logger = logging.getLogger(__name__)
 
 
+def _replace_hyperlinks(html_text):
+    # Find all hyperlinks
+    hyperlinks = BlogPost.find_hyperlinks_in_text(html_text)
+    # Clean hyperlink text
+    hl_text_clean = ["\n" * h[0].startswith("\n") + h[0].replace("\n", " ") + "\n" * h[0].endswith("\n") for h in
+                     hyperlinks]
+    # Replace all hyperlinks with just their text
+    for replace, original in zip(hl_text_clean, hyperlinks):
+        html_text = html_text.replace("".join(["[", original[0], "](", original[1], ")"]), replace)
+    return html_text
+
+
+def _remove_bold_markers(html_text):
+    return html_text.replace("**", "")
+
+
+def _remove_pound_signs(html_text):
+    return html_text.replace("#", "")
+
+
+def _remove_underscores(html_text):
+    return html_text.replace("_", "")
+
+
+def _fix_split_team_word(html_text):
+    # Remove odd situation where word "team" gets split up
+    return html_text.replace("Tea m", "Team")
+
+
+def _remove_empty_lines(html_text):
+    return os.linesep.join([s for s in html_text.splitlines() if s and not s.isspace()])
+
+
+# Clean-up steps applied in order to the html2text output of a post
+TITLE_TEXT_STEPS = [_replace_hyperlinks, _remove_bold_markers, _remove_pound_signs, _remove_empty_lines]
+NORMALIZED_TEXT_STEPS = [_remove_bold_markers, _remove_underscores, _fix_split_team_word, _remove_empty_lines]
+
+
 class BlogPost:
 
     def __init__(self, url, filepath, post_html, date, season):
@@ -20,14 +60,20 @@ class BlogPost:
         self.post_html = post_html
         self.date = date
         self.season = season
+        self.post_id = None
         self.title = None
         self.is_unneeded_post = False
         self.week = None
         self.table = None
         self.teams = None
         self.games = []
+        self._html_text = None
+        self._normalized_text = None
+        self.html_text_seconds = 0
+        self.html_text_uses = 0
 
     def prepare(self, get_scorers=True):
+        self.get_post_id()
         self.get_title()
         if self.is_unneeded_post:
             return self
@@ -38,52 +84,66 @@ class BlogPost:
 
         return self
 
+    def release_html(self):
+        self.post_html = None
+        self._html_text = None
+        self._normalized_text = None
+
+    def get_post_id(self):
+        # Blogger's post ID stays the same when a post moves to another page, so it's used as a stable key
+        post_id_meta = self.post_html.find("meta", itemprop="postId")
+        if post_id_meta:
+            self.post_id = post_id_meta.get("content")
+
+    def get_html_text(self):
+        # The post is serialised and converted to text once, however many extractors ask for it
+        self.html_text_uses += 1
+        if self._html_text is None:
+            start = time.perf_counter()
+            self._html_text = html2text.html2text(str(self.post_html))
+            self.html_text_seconds = time.perf_counter() - start
+        return self._html_text
+
+    def get_normalized_text(self):
+        if self._normalized_text is None:
+            self._normalized_text = self._apply_text_steps(self.get_html_text(), NORMALIZED_TEXT_STEPS)
+        else:
+            self.html_text_uses += 1
+        return self._normalized_text
+
+    @staticmethod
+    def _apply_text_steps(html_text, steps):
+        for step in steps:
+            html_text = step(html_text)
+        return html_text
+
     def get_title(self):
-        html_text = html2text.html2text(str(self.post_html))
-        # Find all hyperlinks
-        hyperlinks = self.find_hyperlinks_in_text(html_text)
-        # Clean hyperlink text
-        hl_text_clean = ["\n" * h[0].startswith("\n") + h[0].replace("\n", " ") + "\n" * h[0].endswith("\n") for h in
-                         hyperlinks]
-        # Replace all hyperlinks with just their text
-        for replace, original in zip(hl_text_clean, hyperlinks):
-            html_text = html_text.replace("".join(["[", original[0], "](", original[1], ")"]), replace)
-        # Remove bold markers and pound signs
-        html_text = html_text.replace("**", "").replace("#", "")
-        # Remove empty lines
-        html_text = os.linesep.join([s for s in html_text.splitlines() if s and not s.isspace()])
+        # A skipped post is recognised from its title heading, without converting the whole post to text
+        heading = self.post_html.find("h3", class_="post-title")
+        if heading is not None:
+            heading_title = " ".join(heading.get_text().split())
+            if load_classifier().is_skipped(heading_title):
+                self.title = heading_title
+                self.check_is_unneeded_post()
+                return
+        html_text = self._apply_text_steps(self.get_html_text(), TITLE_TEXT_STEPS)
         # Return the first line which contains alphabet characters
         for line in html_text.splitlines():
-            if re.search('[a-zA-Z]', line):
+            if patterns.TITLE_LINE.search(line):
                 self.title = line.strip("\n ").strip("\t")
                 self.check_is_unneeded_post()
                 return
 
     def check_is_unneeded_post(self):
-        unneeded_titles = ["Welcome to HIFL 2012/13", "HIFL 2012-13 Cup Draw", "League Schedule 2012/13",
-                           "League 2010-2011 -- Fixtures", "Disciplinary Panel", "Updated Schedule 2012/13",
-                           "HIFL Draft Rules", "Join the Hanoi International Football League now!",
-                           "The 2011-2012 League has finally ended with a double title for Drink Team.",
-                           "HIFL 2011-2012 at a glance", "2011-2012 League Fixture", "FC Thống Nhất Champion!",
-                           "Week One - We're Off!", "The weekend Fixtures", "So it begins.....",
-                           "Some pictures from the 7 a side tournament bia hoi session", "Pre Season 7-a-side fun.",
-                           "2013-2014 Season", "Remaining Fixtures", "Cup Scorers", "HIFL Fixtures 16/3",
-                           "HIFL Cup Draw", "Super Cup - October 15", "Pitches venue", "Captains meeting",
-                           "Roots Bar Tournament - Results", "7th Roots Bar Trounament - June 18th",
-                           "HIFL 2010-2011 at a glance", "Day 14 (last day) -- 14-15/05",
-                           "Chúc mừng năm mới xuân Tân Mão 2011!", "Catch Up Calendar"]
-        if self.title in unneeded_titles:
-            self.is_unneeded_post = True
-        else:
-            self.is_unneeded_post = False
+        self.is_unneeded_post = SKIP in load_classifier().classify(self.title)
 
     @staticmethod
     def find_hyperlinks_in_text(html_text):
         html_text = html_text.strip(" \n[]")
-        return re.findall(r"\[((?:[^\[]|\n?)*?)(?:\])\(((?:.|\n)*?)\)", html_text)
+        return patterns.HYPERLINK.findall(html_text)
 
     def get_week(self):
-        week_strings = re.findall("Week \\b[A-Za-z]+\\b", self.title)
+        week_strings = patterns.WEEK.findall(self.title)
         if week_strings:
             self.week = w2n.word_to_num(week_strings[0].split()[1])
 
@@ -106,12 +166,7 @@ class BlogPost:
                 table = table.rename(columns={table.select_dtypes(exclude=np.number).columns[0]: "Team"})
             self.table = table
         elif "docs.google.com/spreadsheet" in url:
-            r = requests.get(url)
-            redirect_url = r.url
-            sheet_id = redirect_url.split("/")[redirect_url.split("/").index("d") + 1]
-            gid = 0
-            table_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&gid={gid}"
-            self.table = pd.read_csv(table_url)
+            self.table = sheets.get_fetcher().get_table(url)
             self.table = self.table.loc[:, ~self.table.columns.str.contains('^Unnamed')].rename(
                 columns={"#": "Rank", "W": "Won", "D": "Draw", "L": "Loss", "GD": "Goal difference", "Pts": "Points"})
         else:
@@ -127,16 +182,7 @@ class BlogPost:
         self.teams = teams
 
     def get_all_games_in_post(self, get_scorers=True):
-        # Convert html to text
-        html_text = html2text.html2text(str(self.post_html))
-        # Remove bold markers
-        html_text = html_text.replace("**", "")
-        # Remove underscores
-        html_text = html_text.replace("_", "")
-        # Remove odd situation where word "team" gets split up
-        html_text = html_text.replace("Tea m", "Team")
-        # Remove empty lines
-        html_text = os.linesep.join([s for s in html_text.splitlines() if s and not s.isspace()])
+        html_text = self.get_normalized_text()
         league_html, cup_html = self._separate_cup_games(html_text)
         if league_html:
             self.games.extend(self._get_games_from_html_snippet(league_html, "league", get_scorers))
@@ -166,11 +212,12 @@ class BlogPost:
         return games
 
     def _separate_cup_games(self, html_text):
-        if "cup" not in self.title.lower():
+        if "cup" not in load_classifier().classify(self.title):
             logger.debug(f"\"{self.title}\" is not a cup-related blog post")
             return html_text, None
         underlined = [u.text for u in self.post_html.find_all("u")]
-        league_games_heading = next(iter([u for u in underlined if re.findall(r"day \d{1,2}", u.lower())]), None)
+        league_games_heading = next(iter([u for u in underlined if patterns.LEAGUE_DAY_HEADING.findall(u.lower())]),
+                                    None)
         cup_games_heading = next(iter([u for u in underlined if "cup" in u.lower()]), None)
         if not league_games_heading or not cup_games_heading:
             logger.debug(f"\"{self.title}\" has no cup/league headings, treating as a cup-only blog post")
@@ -189,53 +236,49 @@ class BlogPost:
 
     @staticmethod
     def find_games_in_text(html_text):
-        games1 = re.findall(r"(?: *\d. *)?((.*?) ([\d]{1,2}) {0,2}[–-] {0,2}([\d]{1,2}).? (.+?)(?:$|\()(?:(.+)\))?)",
-                           html_text, re.MULTILINE)
+        games1 = patterns.GAME.findall(html_text)
         games1 = [list(g) for g in games1]
-        games2 = re.findall(r"(?: *\d. *)?((.*?) ([\d]{1,2}) ?[–-] ?(.+?) ([\d]{1,2}))(?: *\n)",
-                           html_text)
+        games2 = patterns.GAME_SCORE_AFTER_TEAM.findall(html_text)
         games2 = [[g[0], g[1], g[2], g[4], g[3], ""] for g in games2]
         games =  games1 + games2
         for i in range(len(games)):
-            games[i][0] = re.sub(r" \(agg [\d]{1,2}-[\d]{1,2}\)", "", games[i][0])
+            games[i][0] = patterns.AGG_SCORE.sub("", games[i][0])
             games[i][1] = games[i][1].strip()
             games[i][4] = games[i][4].strip()
-            games[i][-1] = re.sub(r"\) \(agg [\d]{1,2}-[\d]{1,2}", "", games[i][-1])
+            games[i][-1] = patterns.AGG_SCORE_IN_SCORERS.sub("", games[i][-1])
         return games
 
     @staticmethod
     def _get_scorers_str(games, html_text):
         lines = html_text.splitlines()
-        # Find all games in html text and append goals string to game's list
-        for i in range(len(lines)):
-            for j in range(len(games)):
-                if lines[i] == games[j][0]:
-                    if lines[i + 1].startswith("Goals: "):
-                        if lines[i + 1].endswith((";", ",")):
-                            games[j].append(lines[i + 1] + " " + lines[i + 2])
-                        else:
-                            games[j].append(lines[i + 1])
-
-        # Any games for which a goal string wasn't found, add a none goal string
+        # Index games by their string. If the same game string appears more than once, the nth line matching it
+        # belongs to the nth game with that string
+        game_positions = defaultdict(deque)
         for j in range(len(games)):
-            if len(games[j]) == 4:
-                games[j].append(None)
+            game_positions[games[j][0]].append(j)
+        # Any games for which a goal string isn't found keep a none goal string
+        goals_strs = [None] * len(games)
+        for i in range(len(lines)):
+            if not game_positions.get(lines[i]):
+                continue
+            j = game_positions[lines[i]].popleft()
+            k = i + 1
+            if k < len(lines) and lines[k].startswith("Goals: "):
+                goals_str = lines[k]
+                # Goals strings ending in a separator carry on over the following lines
+                while goals_str.endswith((";", ",")) and k + 1 < len(lines) and lines[k + 1] not in game_positions:
+                    k += 1
+                    goals_str += " " + lines[k]
+                goals_strs[j] = goals_str
 
-        return games
+        # The goals line is added to any scorers given in brackets after the score
+        return [games[j][:5] + [" ".join(s for s in [games[j][5], goals_strs[j]] if s) or None]
+                for j in range(len(games))]
 
     def get_cup_participants(self):
-        # Convert html to text
-        html_text = html2text.html2text(str(self.post_html))
-        # Remove bold markers
-        html_text = html_text.replace("**", "")
-        # Remove underscores
-        html_text = html_text.replace("_", "")
-        # Remove odd situation where word "team" gets split up
-        html_text = html_text.replace("Tea m", "Team")
-        # Remove empty lines
-        html_text = os.linesep.join([s for s in html_text.splitlines() if s and not s.isspace()])
-
-        games = re.findall(r"(?:[\d]{1,2}). (.*) vs. (.*)", html_text)
+        html_text = self.get_normalized_text()
+
+        games = patterns.CUP_FIXTURE.findall(html_text)
         teams = [t for g in games for t in g]
 
         return {"season": self.season, "teams": teams}
@@ -1,51 +1,192 @@
 import logging
+import time
+from collections import Counter, defaultdict, deque
+
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
 def compute_missing_games(blog_posts, include_first=False):
+    blog_posts = get_diff_tables(blog_posts, include_first)
+    games = []
+    saved_row = None
+    for bp in blog_posts:
+        # Only keep rows that played a game
+        df_l = bp.diff_table[bp.diff_table["P"] != 0]
+        if saved_row is not None:
+            # If there's a saved row from a previous round of games, add it to this round
+            df_l = pd.concat([df_l, saved_row.to_frame().T], ignore_index=True)
+        teams = df_l["Team"].to_numpy(dtype=object)
+        values = df_l.drop(columns="Team").to_numpy(dtype=np.int64)
+        columns = list(df_l.columns.drop("Team"))
+        pairs, saved_index = match_round(teams, values[:, columns.index("P")], values[:, columns.index("F")],
+                                         values[:, columns.index("A")], values)
+        if saved_index is not None:
+            # The row is kept for every later round, as it's not known which round its opponent will turn up in
+            saved_row = df_l.iloc[saved_index]
+        game_index = len(bp.games)
+        for i, j in pairs:
+            # Indexed after the games found in the post itself so that post ID and game index stay a unique key
+            games.append({"home_team": teams[i], "away_team": teams[j], "home_score": values[i, columns.index("F")],
+                          "away_score": values[i, columns.index("A")], "filepath": bp.filepath,
+                          "post_title": bp.title, "date": bp.date, "season": bp.season, "competition": "league",
+                          "post_id": bp.post_id, "game_index": game_index})
+            game_index += 1
+    games = pd.DataFrame(games)
+    return games
+
+
+def get_diff_tables(blog_posts, include_first=False):
     # Order tables by no. of games played (which should mean chronological)
     blog_posts.sort(key=lambda bp: int(bp.table["P"].sum()))
     # If we're including the first then the difference between itself and the previous is just itself
     if include_first:
-        blog_posts[0].diff_table = blog_posts[0].table
+        blog_posts[0].diff_table = blog_posts[0].table.set_index("Team").astype(int).reset_index()
     # Subtract the previous table from each table
     for i in range(1, len(blog_posts)):
-        blog_posts[i].diff_table = blog_posts[i].table.sort_values("Team").set_index("Team").applymap(int).subtract(
-            blog_posts[i-1].table.sort_values("Team").set_index("Team").applymap(int)).reset_index()
+        blog_posts[i].diff_table = blog_posts[i].table.sort_values("Team").set_index("Team").astype(int).subtract(
+            blog_posts[i-1].table.sort_values("Team").set_index("Team").astype(int)).reset_index()
     if not include_first:
         blog_posts = blog_posts[1:]
+    return blog_posts
+
+
+def match_round(teams, played, goals_for, goals_against, values):
+    # Pairs each row with the first other row, in table order, whose for/against is its against/for. Rows are
+    # looked up by (F, A) so each pairing is a hash lookup rather than a filter over the whole round. Returns the
+    # (home, away) row pairs and the last row that played but couldn't be matched
+    n = len(teams)
+    by_score = defaultdict(deque)
+    by_row = defaultdict(list)
+    for i in range(n):
+        by_score[(goals_for[i], goals_against[i])].append(i)
+        # Rows identical in every column are removed together when one of them is matched
+        by_row[(teams[i],) + tuple(values[i])].append(i)
+    available = np.ones(n, dtype=bool)
+    available_per_team = defaultdict(int)
+    for team in teams:
+        available_per_team[team] += 1
+    remaining = n
+    pairs = []
+    saved_index = None
+    for i in range(n):
+        if remaining == 0:
+            # If there's no games left to match then stop
+            break
+        elif not available_per_team[teams[i]]:
+            # This team's match has already been found
+            continue
+        candidates = by_score.get((goals_against[i], goals_for[i]), ())
+        while candidates and not available[candidates[0]]:
+            candidates.popleft()
+        matches = [j for j in candidates if available[j] and teams[j] != teams[i]]
+        if not matches:
+            # If a match can't be found save the row to be checked in the next round of games
+            if played[i] != 0:
+                saved_index = i
+            continue
+        if len({teams[j] for j in matches}) > 1:
+            logger.info(f"{teams[i]} {goals_for[i]}-{goals_against[i]} could be against any of "
+                        f"{', '.join(dict.fromkeys(teams[j] for j in matches))}, pairing with {teams[matches[0]]}")
+        j = matches[0]
+        for k in by_row[(teams[j],) + tuple(values[j])] + by_row[(teams[i],) + tuple(values[i])]:
+            if available[k]:
+                available[k] = False
+                available_per_team[teams[k]] -= 1
+                remaining -= 1
+        pairs.append((i, j))
+    return pairs, saved_index
+
+
+def reconstruct_missing_games(blog_posts, include_first=False, time_limit=10):
+    # Unlike compute_missing_games, every pairing of a round's rows is considered. The most complete pairing is used,
+    # and each game gets the fraction of equally complete pairings that contain it as its confidence. Every row left
+    # unmatched is carried into the next round, not just the last one
+    blog_posts = get_diff_tables(blog_posts, include_first)
     games = []
-    saved_row = pd.DataFrame(columns=[])
+    carried = pd.DataFrame()
     for bp in blog_posts:
-        # Only keep rows that played a game
-        df_l = bp.diff_table.drop(bp.diff_table[bp.diff_table["P"] == 0].index)
-        if not saved_row.empty:
-            # If there's a saved row from a previous round of games, add it to this round
-            df_l = df_l.append(saved_row).reset_index().drop(["level_0", "index"], axis=1, errors="ignore")
-        df_r = df_l.copy(deep=True)
-        for index, row in df_l.iterrows():
-            if df_r.empty:
-                # If there's no games left to match then break the loop
-                break
-            elif row["Team"] not in df_r["Team"].to_list():
-                # If this team has already been removed on a previous iteration, i.e., the match has been found then
-                # skip on
-                continue
-            # Find team in right df that matches the result of this row in left df
-            match = df_r[(df_r["F"] == row["A"]) & (df_r["A"] == row["F"]) & (df_r["Team"] != row["Team"])]
-            # If a match can't be found save the row to be checked in the next round of games
-            if match.empty and int(row["P"]) != 0:
-                saved_row = row
-                continue
-            elif match.empty:
-                continue
-            match = match.iloc[0]
-            # Remove both the matching row and the checked row... I think
-            df_r = df_r[~(df_r.eq(match).all(axis=1) | df_r.eq(row).all(axis=1))]
-            games.append({"home_team": row["Team"], "away_team": match["Team"], "home_score": row["F"],
-                          "away_score": row["A"], "filepath": bp.filepath, "post_title": bp.title, "date": bp.date,
-                          "season": bp.season, "competition": "league"})
+        df_l = pd.concat([bp.diff_table[bp.diff_table["P"] != 0], carried], ignore_index=True)
+        multiple_games = df_l[df_l["P"].astype(int) > 1]
+        if not multiple_games.empty:
+            logger.warning(f"Can't split the results of {', '.join(multiple_games['Team'])} in \"{bp.title}\" "
+                           f"into single games")
+        df_l = df_l[df_l["P"].astype(int) == 1].reset_index(drop=True)
+        teams = df_l["Team"].to_numpy(dtype=object)
+        goals_for = df_l["F"].to_numpy(dtype=np.int64)
+        goals_against = df_l["A"].to_numpy(dtype=np.int64)
+        pairs, unmatched = solve_round(teams, goals_for, goals_against, time.monotonic() + time_limit)
+        carried = df_l.iloc[unmatched]
+        game_index = len(bp.games)
+        for i, j, confidence in pairs:
+            games.append({"home_team": teams[i], "away_team": teams[j], "home_score": goals_for[i],
+                          "away_score": goals_against[i], "filepath": bp.filepath, "post_title": bp.title,
+                          "date": bp.date, "season": bp.season, "competition": "league", "post_id": bp.post_id,
+                          "game_index": game_index, "confidence": confidence, "ambiguous": not confidence == 1})
+            game_index += 1
+    if not carried.empty:
+        logger.warning(f"No games could be found for {', '.join(carried['Team'])}")
     games = pd.DataFrame(games)
     return games
+
+
+def solve_round(teams, goals_for, goals_against, deadline):
+    # Rows can only pair with rows of the opposite score, so each (F, A)/(A, F) group is solved on its own. Returns
+    # (home, away, confidence) for the chosen pairing and the rows left unmatched. A group that can't be solved
+    # before the deadline falls back to the greedy pairing with no confidence
+    groups = defaultdict(list)
+    for i in range(len(teams)):
+        groups[tuple(sorted((goals_for[i], goals_against[i])))].append(i)
+    pairs = []
+    unmatched = []
+    for rows in groups.values():
+        compatible = {i: [j for j in rows if j != i and teams[j] != teams[i] and goals_for[j] == goals_against[i]
+                          and goals_against[j] == goals_for[i]] for i in rows}
+        try:
+            group_pairs = _solve_group(rows, compatible, deadline)
+        except TimeoutError:
+            logger.warning(f"Gave up looking for every pairing of {', '.join(teams[i] for i in rows)}")
+            greedy_pairs, _ = match_round(teams[rows], np.ones(len(rows)), goals_for[rows], goals_against[rows],
+                                          np.stack([goals_for[rows], goals_against[rows]], axis=1))
+            group_pairs = [(rows[i], rows[j], np.nan) for i, j in greedy_pairs]
+        pairs.extend(group_pairs)
+        matched = {i for pair in group_pairs for i in pair[:2]}
+        unmatched.extend(i for i in rows if i not in matched)
+    return sorted(pairs), sorted(unmatched)
+
+
+def _solve_group(rows, compatible, deadline):
+    bits = {row: 1 << k for k, row in enumerate(rows)}
+    memo = {}
+
+    def solve(mask):
+        # Returns (no. of games, no. of pairings with that many games, pairing counts per game, one such pairing)
+        if mask == 0:
+            return 0, 1, Counter(), ()
+        if mask in memo:
+            return memo[mask]
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        i = rows[(mask & -mask).bit_length() - 1]
+        rest = mask & ~bits[i]
+        options = []
+        for j in compatible[i]:
+            if rest & bits[j]:
+                size, ways, counts, pairing = solve(rest & ~bits[j])
+                counts = counts.copy()
+                counts[(i, j)] += ways
+                options.append((size + 1, ways, counts, ((i, j),) + pairing))
+        # Leaving the row unmatched is also an option, so pairings that differ in which rows go unmatched count too
+        options.append(solve(rest))
+        best_size = max(option[0] for option in options)
+        best = [option for option in options if option[0] == best_size]
+        counts = Counter()
+        for option in best:
+            counts.update(option[2])
+        memo[mask] = (best_size, sum(option[1] for option in best), counts, best[0][3])
+        return memo[mask]
+
+    _, ways, counts, pairing = solve(sum(bits.values()))
+    return [(i, j, counts[(i, j)] / ways) for i, j in pairing]
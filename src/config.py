@@ -0,0 +1,98 @@
+import csv
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from types import MappingProxyType
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# The C loader is several times faster but only there when PyYAML was built against libyaml
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SITE_NAMES_PATH = "data/match_site_names/match_site_names.yml"
+# The config files ship with the code, so they're found from the repo root rather than the working directory
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+_cache = {}
+_lock = threading.Lock()
+# Per path: no. of times it was parsed, no. of times the parsed copy was reused and seconds spent parsing
+load_stats = defaultdict(lambda: {"loads": 0, "hits": 0, "seconds": 0.0})
+
+
+def load(paths, parse):
+    # Parses the file(s) once and hands out the same result until one of them is modified. paths is a path or a tuple
+    # of paths that parse takes together. The same file can be read by different parse functions, each kept apart
+    path_tuple = paths if isinstance(paths, tuple) else (paths,)
+    key = (parse, *((os.path.abspath(p), os.stat(p).st_mtime_ns) for p in path_tuple))
+    with _lock:
+        if key in _cache:
+            load_stats[paths]["hits"] += 1
+            return _cache[key]
+    start = time.perf_counter()
+    value = parse(*path_tuple)
+    with _lock:
+        # Drop the copy parsed from an older version of the file(s)
+        for old_key in [k for k in _cache if k[0] == parse and [p for p, _ in k[1:]] == [p for p, _ in key[1:]]]:
+            del _cache[old_key]
+        _cache[key] = value
+        load_stats[paths]["loads"] += 1
+        load_stats[paths]["seconds"] += time.perf_counter() - start
+    return value
+
+
+def load_site_names(path=SITE_NAMES_PATH):
+    return load(path, _parse_site_names)
+
+
+def load_dropouts(path):
+    return load(path, _parse_dropouts)
+
+
+def load_forced_pseudonyms(path):
+    return load(path, _parse_forced_pseudonyms)
+
+
+def load_season_configs(config_dir, extension, read):
+    # {season name: config} for every season's file in the directory, e.g., data/dropouts/2014_15.csv
+    if not os.path.isdir(config_dir):
+        return {}
+    return {filename[:-len(extension)].replace('_', '/'): read(os.path.join(config_dir, filename))
+            for filename in sorted(os.listdir(config_dir)) if filename.endswith(extension)}
+
+
+def get_timing_report():
+    return "\n".join(f"{', '.join(paths) if isinstance(paths, tuple) else paths}: parsed {stats['loads']} times in "
+                     f"{stats['seconds']:.4f}s, reused {stats['hits']} times" for paths, stats in load_stats.items())
+
+
+def _parse_site_names(path):
+    # {team name: name used by the site}
+    with open(path) as inputfile:
+        site_names = yaml.load(inputfile, Loader=YAML_LOADER) or {}
+    if not isinstance(site_names, dict) or \
+            not all(isinstance(k, str) and isinstance(v, str) for k, v in site_names.items()):
+        raise ValueError(f"{path} should map team names to site names")
+    return MappingProxyType(site_names)
+
+
+def _parse_dropouts(path):
+    # One team per row, only the first column is used
+    with open(path, newline='') as inputfile:
+        rows = list(csv.reader(inputfile))
+    if not all(row and row[0] for row in rows):
+        raise ValueError(f"{path} has a row without a team name")
+    return tuple(row[0] for row in rows)
+
+
+def _parse_forced_pseudonyms(path):
+    # {team name: [pseudonyms]}
+    with open(path) as inputfile:
+        pseudonyms = yaml.load(inputfile, Loader=YAML_LOADER) or {}
+    if not isinstance(pseudonyms, dict) or \
+            not all(isinstance(k, str) and isinstance(v, list) and all(isinstance(p, str) for p in v)
+                    for k, v in pseudonyms.items()):
+        raise ValueError(f"{path} should map team names to lists of pseudonyms")
+    return MappingProxyType({k: tuple(v) for k, v in pseudonyms.items()})
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.files import atomic_write, write_json
+
+logger = logging.getLogger(__name__)
+
+
+class PageDownloader:
+
+    def __init__(self, start_url, page_dir="data/pages", session=None, workers=4, timeout=30):
+        self.start_url = start_url
+        self.page_dir = page_dir
+        self.manifest_path = os.path.join(page_dir, "manifest.json")
+        self.workers = workers
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def crawl(self, refresh=False):
+        # Returns the filepaths of all pages that were new or whose content changed
+        Path(self.page_dir).mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        known_pages = list(manifest["pages"])
+        changed = []
+        if manifest["complete"] and not refresh:
+            logger.info(f"All {len(known_pages)} pages of {self.start_url} have already been downloaded")
+            return changed
+        # An interrupted crawl carries on from its last saved page even on a refresh, only a complete one is revalidated
+        if known_pages and not manifest["complete"]:
+            next_url = known_pages[-1]["older_link"]
+            logger.info(f"Resuming crawl of {self.start_url} from page {len(known_pages)}")
+        elif known_pages:
+            next_url, changed = self._revalidate(manifest)
+        else:
+            next_url = self.start_url
+        pages = manifest["pages"]
+        while next_url:
+            index = len(pages)
+            entry = self._fetch(next_url, index, known_pages[index] if index < len(known_pages) else None)
+            pages.append(entry)
+            if entry.pop("changed"):
+                changed.append(self._get_filepath(entry))
+            # Save after every page so an interrupted crawl can pick up where it left off
+            self._save_manifest(manifest)
+            next_url = entry["older_link"]
+        manifest["complete"] = True
+        self._save_manifest(manifest)
+        self._remove_stale_pages(len(pages))
+        return list(dict.fromkeys(changed))
+
+    def _revalidate(self, manifest):
+        # The known pages are refetched concurrently with conditional requests, then the chain of older links is
+        # checked against the manifest. If posts have shifted between pages the crawl carries on from the first page
+        # whose older link no longer matches
+        pages = manifest["pages"]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            entries = list(executor.map(self._fetch, [p["url"] for p in pages], range(len(pages)), pages))
+        changed = []
+        for i, entry in enumerate(entries):
+            if entry.pop("changed"):
+                changed.append(self._get_filepath(entry))
+            next_url = entry["older_link"]
+            if i + 1 == len(entries) or next_url != entries[i + 1]["url"]:
+                manifest["pages"] = entries[:i + 1]
+                manifest["complete"] = False
+                self._save_manifest(manifest)
+                return next_url, changed
+        return None, changed
+
+    def _fetch(self, url, index, entry):
+        filepath = os.path.join(self.page_dir, f"page{index}.html")
+        headers = {}
+        if entry and entry["url"] == url and os.path.isfile(filepath):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        logger.debug(f"Downloading {url}")
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            with open(filepath, "rb") as page_file:
+                content = page_file.read()
+            etag, last_modified = entry.get("etag"), entry.get("last_modified")
+        else:
+            response.raise_for_status()
+            content = response.content
+            etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        sha256 = hashlib.sha256(content).hexdigest()
+        old_sha256 = self._get_file_hash(filepath)
+        if sha256 != old_sha256:
+            self._write_page(filepath, content)
+
+        return {"url": url,
+                "file": os.path.basename(filepath),
+                "etag": etag,
+                "last_modified": last_modified,
+                "sha256": sha256,
+                "older_link": self._get_older_link(content),
+                "changed": sha256 != old_sha256}
+
+    @staticmethod
+    def _get_older_link(content):
+        soup = BeautifulSoup(content, "html.parser", parse_only=SoupStrainer("a", class_="blog-pager-older-link"))
+        link = soup.find("a")
+        return link.get("href") if link else None
+
+    @staticmethod
+    def _get_file_hash(filepath):
+        if not os.path.isfile(filepath):
+            return None
+        with open(filepath, "rb") as page_file:
+            return hashlib.sha256(page_file.read()).hexdigest()
+
+    @staticmethod
+    def _write_page(filepath, content):
+        with atomic_write(filepath, "wb") as page_file:
+            page_file.write(content)
+
+    def _get_filepath(self, entry):
+        return os.path.join(self.page_dir, entry["file"])
+
+    def _remove_stale_pages(self, page_count):
+        # If the blog now spans fewer pages than before, the leftover files would otherwise be parsed again
+        index = page_count
+        while os.path.isfile(os.path.join(self.page_dir, f"page{index}.html")):
+            os.remove(os.path.join(self.page_dir, f"page{index}.html"))
+            index += 1
+
+    def _load_manifest(self):
+        if os.path.isfile(self.manifest_path):
+            with open(self.manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+            if manifest["start_url"] == self.start_url:
+                return manifest
+            logger.warning(f"{self.manifest_path} belongs to {manifest['start_url']}, starting a new crawl")
+        return {"start_url": self.start_url, "complete": False, "pages": []}
+
+    def _save_manifest(self, manifest):
+        write_json(self.manifest_path, manifest)
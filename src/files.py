@@ -0,0 +1,25 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_write(path, mode="w", **kwargs):
+    # Yields a file to write the new content of path to. It's written next to path under a name of its own per
+    # process and only then moved over path, so an interrupted run or another process reading or writing the same path
+    # never sees a truncated file
+    Path(os.path.dirname(path) or ".").mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, **kwargs) as output_file:
+            yield output_file
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_json(path, data):
+    with atomic_write(path, encoding="utf-8") as output_file:
+        json.dump(data, output_file, indent=2, ensure_ascii=False, sort_keys=True)
@@ -0,0 +1,45 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class FixtureMatrix:
+    # counts[i, j] is the no. of games with teams[i] at home to teams[j]. In a double round robin every off-diagonal
+    # count should be 1, so missing, duplicated and home/away swapped fixtures are all read straight off the matrix
+
+    def __init__(self, teams, games):
+        self.teams = list(teams)
+        self.home_codes = pd.Categorical(games["home_team"], categories=self.teams).codes
+        self.away_codes = pd.Categorical(games["away_team"], categories=self.teams).codes
+        # Games involving a team that isn't in the final table have a code of -1
+        self.known = (self.home_codes >= 0) & (self.away_codes >= 0)
+        self.counts = np.zeros((len(self.teams), len(self.teams)), dtype=np.int64)
+        np.add.at(self.counts, (self.home_codes[self.known], self.away_codes[self.known]), 1)
+
+    def get_missing(self):
+        # Listed as each pair's home then away fixture, pairs in final table order
+        i, j = np.triu_indices(len(self.teams), k=1)
+        pairs = np.stack([np.stack([i, j], axis=1), np.stack([j, i], axis=1)], axis=1).reshape(-1, 2)
+        return self._to_fixtures(pairs[self.counts[pairs[:, 0], pairs[:, 1]] == 0])
+
+    def get_duplicates(self):
+        return self._to_fixtures(np.argwhere(self.counts > 1))
+
+    def get_reversed(self):
+        # Fixtures played more than once whose reverse fixture was never played, i.e., one of them was probably
+        # written with home and away the wrong way round
+        return self._to_fixtures(np.argwhere((self.counts > 1) & (self.counts.T == 0)))
+
+    def get_game_mask(self, fixtures):
+        # Boolean mask over the games that were played as any of the given fixtures
+        fixture_codes = pd.Categorical(fixtures["home_team"], categories=self.teams).codes * len(self.teams) + \
+            pd.Categorical(fixtures["away_team"], categories=self.teams).codes
+        game_codes = self.home_codes.astype(np.int64) * len(self.teams) + self.away_codes
+        return self.known & np.isin(game_codes, fixture_codes)
+
+    def _to_fixtures(self, pairs):
+        teams = np.array(self.teams, dtype=object)
+        return pd.DataFrame({"home_team": teams[pairs[:, 0]], "away_team": teams[pairs[:, 1]]})
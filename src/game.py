@@ -1,13 +1,16 @@
 import logging
-import re
 from fuzzywuzzy import process, fuzz
 
+from src import patterns
 from src.team import Team
 
 logger = logging.getLogger(__name__)
 
 
 class Game:
+    # Thousands are made per run, slots keep each one to a fixed set of attributes without a __dict__
+    __slots__ = ("url", "filepath", "date", "season", "competition", "game_str", "home_team", "home_score",
+                 "away_team", "away_score", "goals_str", "scorers")
 
     def __init__(self):
         self.url = None
@@ -46,24 +49,19 @@ class Game:
     @staticmethod
     def _get_team_name(team_name_str):
         # Find team name in string
-        team_name = re.findall(r"([^()]*)( (\((.*)\)))?", team_name_str)[0][0]
+        team_name = patterns.TEAM_NAME.findall(team_name_str)[0][0]
         # Strip characters from each end of team name
         team_name = team_name.strip(" #_*")
         # Remove numbering from list at start of string. e.g., "4. Team Name"
-        team_name = re.sub(r"\d. ", "", team_name)
+        team_name = patterns.LIST_NUMBER.sub("", team_name)
 
         return team_name
 
     def get_all_scorers(self):
         if self.goals_str is None:
             return
-        regex_patterns = [f"Goals: ({self.home_team}):?([^;]*);? ?(?:({self.away_team}):?(.*))",
-                          r"Goals: (.*):(.*);( (.*):(.*).)?",
-                          r"Goals: (.*):(.*)\.(.*)(.*)(.*)",
-                          r"Goals: (.*):(.*)(.*)(.*)(.*)",
-                          f"Goals: ({self.home_team})(.*)(({self.away_team})(.*))"]
-        for reg in regex_patterns:
-            found = re.findall(reg, self.goals_str)
+        for reg in patterns.get_scorer_patterns(self.home_team, self.away_team):
+            found = reg.findall(self.goals_str)
             if found:
                 goal_str_els = [x.strip(" ,;") for x in list(found[0])]
                 break
@@ -92,15 +90,15 @@ class Game:
 
     @staticmethod
     def _get_scorers_for_team(scorers_str, team):
-        scorers = [{"name": s.strip(), "team": team} for s in re.split(',(?![^\(\[]*[\]\)])', scorers_str)]
+        scorers = [{"name": s.strip(), "team": team} for s in patterns.SCORER_SEPARATOR.split(scorers_str)]
         # If the scorer string isn't a name, then remove it
         scorers = [s for s in scorers if s["name"] not in ["?"]]
         # Count goals
         for i in range(len(scorers)):
             # Check for multiple goals in the format "name x N"
-            multiple_goals_x = re.findall(r"(.*)x *([\d]+)", scorers[i]["name"])
+            multiple_goals_x = patterns.MULTIPLE_GOALS_X.findall(scorers[i]["name"])
             # Check for multiple goals in the format "name (time, time, ...)"
-            multiple_goals_bracket = re.findall(r"(.*)\((.*)\)", scorers[i]["name"])
+            multiple_goals_bracket = patterns.MULTIPLE_GOALS_BRACKET.findall(scorers[i]["name"])
             if multiple_goals_x:
                 scorers[i]["name"] = multiple_goals_x[0][0].strip()
                 scorers[i]["goals"] = int(multiple_goals_x[0][-1])
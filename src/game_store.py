@@ -0,0 +1,109 @@
+import logging
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = "data/games/store"
+# Seasons are written as e.g. "2014/15", which can't be used as a directory name
+PARTITION_COLUMN = "season_key"
+CATEGORY_COLUMNS = ["home_team", "away_team", "season", "competition"]
+SCORE_COLUMNS = ["home_score", "away_score"]
+
+
+def get_season_key(season):
+    return str(season).replace("/", "_")
+
+
+def to_store_types(games_df):
+    # Team, season and competition strings are stored once per partition as categories, scores as nullable int8
+    # (walkovers and reconstructed games can be missing one) and dates as datetimes
+    games_df = games_df.copy()
+    for column in CATEGORY_COLUMNS:
+        if column in games_df:
+            games_df[column] = games_df[column].astype("category")
+    for column in SCORE_COLUMNS:
+        if column in games_df:
+            games_df[column] = pd.to_numeric(games_df[column]).astype("Int8")
+    if "date" in games_df:
+        games_df["date"] = pd.to_datetime(games_df["date"])
+    if "post_id" in games_df:
+        games_df["post_id"] = games_df["post_id"].astype("string")
+    return games_df
+
+
+class GameStore:
+    # Games as a Parquet dataset partitioned by season, so reading a season only touches that season's files and
+    # only the requested columns are decoded
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+
+    def exists(self):
+        return os.path.isdir(self.store_dir)
+
+    def write(self, games):
+        # games is a DataFrame or an iterable of them. Each chunk is written to its own file in every season it has
+        # games for, so only one chunk is held in memory at a time. Chunks needn't all have the same columns
+        chunks = [games] if isinstance(games, pd.DataFrame) else games
+        # Written next to the store and swapped in, so readers never see a half written store
+        tmp_dir = self.store_dir + ".tmp"
+        old_dir = self.store_dir + ".old"
+        for path in [tmp_dir, old_dir]:
+            shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        n_games = 0
+        for i, games_df in enumerate(chunks):
+            if games_df.empty:
+                continue
+            games_df = to_store_types(games_df).reset_index(drop=True)
+            games_df[PARTITION_COLUMN] = games_df["season"].map(get_season_key).astype(str)
+            # Numbered so that a season's files are read back in the order they were written
+            games_df.to_parquet(tmp_dir, engine="pyarrow", partition_cols=[PARTITION_COLUMN], index=False,
+                                basename_template=f"chunk-{i:05d}-{{i}}.parquet")
+            n_games += len(games_df)
+        if self.exists():
+            os.replace(self.store_dir, old_dir)
+        os.replace(tmp_dir, self.store_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        logger.info(f"Stored {n_games} games in {self.store_dir}")
+
+    def get_season_keys(self):
+        return sorted(name.split("=", 1)[1] for name in os.listdir(self.store_dir)
+                      if name.startswith(PARTITION_COLUMN + "="))
+
+    def read(self, seasons=None, competitions=None, columns=None):
+        return self._read([get_season_key(s) for s in seasons] if seasons is not None else None, competitions,
+                          columns)
+
+    def _read(self, season_keys=None, competitions=None, columns=None):
+        filters = []
+        if season_keys is not None:
+            filters.append((PARTITION_COLUMN, "in", season_keys))
+        if competitions is not None:
+            filters.append(("competition", "in", list(competitions)))
+        dataset = ds.dataset(self.store_dir, format="parquet", partitioning="hive")
+        # Columns only some chunks have, e.g., the confidence of reconstructed games, are null in the others
+        schema = pa.unify_schemas([dataset.schema] + [f.physical_schema for f in dataset.get_fragments()])
+        dataset = ds.dataset(self.store_dir, schema=schema, format="parquet", partitioning="hive")
+        table = dataset.to_table(columns=columns, filter=pq.filters_to_expression(filters) if filters else None)
+        games_df = table.to_pandas().drop(columns=PARTITION_COLUMN, errors="ignore")
+        # Each chunk has its own categories, sorted again as if the games had been stored all at once
+        for column in CATEGORY_COLUMNS:
+            if column in games_df:
+                games_df[column] = games_df[column].cat.reorder_categories(sorted(games_df[column].cat.categories))
+        return games_df
+
+    def export_csv(self, path, seasons=None):
+        # Season by season, so only one season's games are in memory at a time
+        season_keys = sorted(get_season_key(s) for s in seasons) if seasons is not None else self.get_season_keys()
+        with atomic_write(path, newline="") as csv_file:
+            for i, season_key in enumerate(season_keys):
+                self._read([season_key]).to_csv(csv_file, header=not i, index=False)
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.files import write_json
+from src.post_cache import get_file_hash, get_parser_version
+
+logger = logging.getLogger(__name__)
+
+GAME_KEY = ["post_id", "game_index"]
+
+
+def load_manifest(path):
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def save_manifest(path, manifest):
+    write_json(path, manifest)
+
+
+def get_page_hashes(filepaths):
+    return {filepath: get_file_hash(filepath) for filepath in filepaths}
+
+
+def get_changed_pages(page_hashes, manifest):
+    # Returns the pages that are new or changed since the manifest was written, and the pages that have since been
+    # removed. A parser version bump or a change to the post classification means every page has to be parsed again
+    old_hashes = manifest.get("pages", {})
+    removed = [filepath for filepath in old_hashes if filepath not in page_hashes]
+    if manifest.get("parser_version") != get_parser_version():
+        return list(page_hashes), removed
+    changed = [filepath for filepath, sha256 in page_hashes.items() if old_hashes.get(filepath) != sha256]
+    return changed, removed
+
+
+def merge_games(games_df, new_games_df, replaced_post_ids, replaced_filepaths, filepaths):
+    # Games from reparsed posts replace every game previously stored for those posts, keyed by post ID and game
+    # index. Games left behind on changed or removed pages belong to posts that no longer exist there
+    stale = games_df["post_id"].isin(replaced_post_ids) | games_df["filepath"].isin(replaced_filepaths)
+    merged = pd.concat([games_df[~stale], new_games_df], ignore_index=True)
+    merged = merged[merged["post_id"].isna() | ~merged.duplicated(GAME_KEY, keep="last")]
+    # Back into the order of the pages in filepaths, as a full run has them. All the games of a page come from one of
+    # the two frames, so the stable sort keeps its posts and their games in order
+    page_order = merged["filepath"].map({filepath: i for i, filepath in enumerate(filepaths)}).fillna(len(filepaths))
+    return merged.iloc[np.argsort(page_order.values, kind="stable")].reset_index(drop=True)
+
+
+def get_season_fingerprint(season_games, final_table, config_paths):
+    sha256 = hashlib.sha256()
+    # Row hashes are sorted so the fingerprint doesn't depend on the order games were merged in
+    sha256.update(np.sort(pd.util.hash_pandas_object(season_games, index=False).values).tobytes())
+    sha256.update(pd.util.hash_pandas_object(final_table, index=False).values.tobytes())
+    for path in config_paths:
+        if os.path.isfile(path):
+            sha256.update(get_file_hash(path).encode())
+    return sha256.hexdigest()
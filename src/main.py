@@ -3,17 +3,39 @@ import logging.config
 import os
 import json
 import argparse
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
 
-from blog import Blog
-from page import Page
-from season import Season
-from compute_missing_games import compute_missing_games
+from src.blog import Blog
+from src.files import atomic_write
+from src.page import Page
+from src.post_cache import fetch_records, get_game_columns, get_page_filepaths, get_parser_version, load_records
+from src.incremental import get_changed_pages, get_page_hashes, get_season_fingerprint, load_manifest, merge_games, \
+    save_manifest
+from src.season import Season
+from src.game_store import GameStore
+from src.overlays import OverlayStack
+from src.reconciliation import REPORT_PATH, reconcile_season, save_report
+from src.team_names import TeamNameIndex
+from src.config import get_timing_report, load_dropouts, load_forced_pseudonyms, load_season_configs
+from src import sheets
+from src.reconstruction_jobs import get_job_fingerprint, load_jobs, run_job, select_job_posts
 
 logger = logging.getLogger(__name__)
 
+# Games rebuilt by each reconstruction job, see config/reconstruction_jobs.yml
+RECONSTRUCTED_DIR = "data/games/reconstructed"
+# Games are written to the store in chunks of at least this many
+GAME_CHUNK_SIZE = 5000
+# Operations that read every page, from the blog itself with --from-web
+PAGE_OPERATIONS = ["get_all_games", "get_all_final_tables", "get_cup_participants"]
+# Team strings already resolved to each season's team names
+TEAM_NAMES_CACHE_PATH = "data/cache/team_names.json"
+
 
 def configure_logging(logging_config_path: str) -> None:
     if not os.path.exists(logging_config_path):
@@ -29,69 +51,189 @@ def configure_logging(logging_config_path: str) -> None:
 
 def get_all_pages(blog: Blog) -> None:
     logger.info(f"Getting all pages from {blog.url}")
-    blog.save_all_pages()
+    changed = blog.save_all_pages(refresh=True)
+    logger.info(f"{len(changed)} pages are new or have changed")
+
+
+def get_post_records(page_dir: str, workers: int = 1, filepaths: list = None, page_urls: list = None) -> list:
+    return list(iter_post_records(page_dir, workers, filepaths, page_urls))
+
+
+def iter_post_records(page_dir: str, workers: int = 1, filepaths: list = None, page_urls: list = None):
+    # From the saved pages, or from the blog itself when page URLs are given, one page at a time
+    if page_urls is not None:
+        page_records = fetch_records(page_urls, workers)
+    else:
+        if filepaths is None:
+            filepaths = get_page_filepaths(page_dir)
+        page_records = load_records(filepaths, workers)
+    for page, records_on_page in page_records:
+        yield from records_on_page
+        logger.info(f"{os.path.basename(page) if page_urls is None else page} complete")
+
+
+def get_page_urls(blog: Blog, page_dir: str) -> list:
+    # The URLs of the last crawl let every page be fetched at once, otherwise each page's older link has to be followed.
+    # New posts push older ones onto later pages, so the last crawl's URLs would miss some of them. They're only used
+    # while the first page still links to the same older page as it did then
+    manifest_path = os.path.join(page_dir, "manifest.json")
+    if os.path.isfile(manifest_path):
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        pages = manifest["pages"]
+        if manifest["start_url"] == blog.url and manifest["complete"] and pages and \
+                blog.get_older_link(blog.url) == pages[0]["older_link"]:
+            return [p["url"] for p in pages]
+        logger.warning(f"{manifest_path} is incomplete or out of date, following every page's older link instead")
+    return blog.get_all_page_urls()
+
+
+def profile_text_conversion(page_dir: str) -> None:
+    # Parses every page from scratch, bypassing the post cache, and reports how long html2text took on each page and
+    # how much time sharing one conversion per post between the extractors saved
+    logger.info("Profiling html2text conversion")
+    for filepath in get_page_filepaths(page_dir):
+        blog_posts = list(Page(None, filepath).get_all_posts("local"))
+        conversion_seconds = sum(bp.html_text_seconds for bp in blog_posts)
+        saved_seconds = sum(bp.html_text_seconds * max(bp.html_text_uses - 1, 0) for bp in blog_posts)
+        logger.info(f"{os.path.basename(filepath)}: html2text took {conversion_seconds:.3f}s for {len(blog_posts)} "
+                    f"posts, reusing the conversion saved {saved_seconds:.3f}s")
+
+
+def get_games_from_posts(blog_posts: list) -> pd.DataFrame:
+    columns = get_game_columns(bp for bp in blog_posts if not bp.is_unneeded_post)
+    # Without games it has no columns either, like the frame built from no games used to, so concatenating it with
+    # other games leaves their types alone
+    return pd.DataFrame(columns) if len(columns["date"]) else pd.DataFrame()
+
 
+def get_game_chunks(blog_posts, chunk_size: int = GAME_CHUNK_SIZE):
+    # DataFrames of the posts' games, each of at least chunk_size games bar the last
+    chunk = []
+    n_games = 0
+    for bp in blog_posts:
+        if bp.is_unneeded_post:
+            continue
+        chunk.append(bp)
+        n_games += len(bp.games)
+        if n_games >= chunk_size:
+            yield get_games_from_posts(chunk)
+            chunk = []
+            n_games = 0
+    if chunk:
+        yield get_games_from_posts(chunk)
 
-def get_all_games() -> None:
+
+def reconstruct_games(jobs: tuple, job_posts: list, reconstruction: str = "greedy", workers: int = 1) -> list:
+    # The games of each job with posts to reconstruct from, in the order of jobs. A job is only run again when its
+    # definition or the posts it picks have changed since its games were saved. Jobs are independent of each other,
+    # so the ones that have changed run in a process pool
+    manifest_path = os.path.join(RECONSTRUCTED_DIR, "manifest.json")
+    manifest = load_manifest(manifest_path)
+    runnable = [(job, posts) for job, posts in zip(jobs, job_posts) if posts]
+    fingerprints = {job.name: get_job_fingerprint(job, posts, reconstruction) for job, posts in runnable}
+    paths = {job.name: os.path.join(RECONSTRUCTED_DIR, f"{job.name}.csv") for job, _ in runnable}
+    changed = [(job, posts) for job, posts in runnable
+               if manifest.get(job.name) != fingerprints[job.name] or not os.path.isfile(paths[job.name])]
+    logger.info(f"{len(changed)} of {len(runnable)} reconstruction jobs have changed")
+    if workers > 1 and len(changed) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_job, [job for job, _ in changed], [posts for _, posts in changed],
+                                        [reconstruction] * len(changed)))
+    else:
+        results = [run_job(job, posts, reconstruction) for job, posts in changed]
+    Path(RECONSTRUCTED_DIR).mkdir(parents=True, exist_ok=True)
+    for (job, _), games_df in zip(changed, results):
+        with atomic_write(paths[job.name], newline="") as csv_file:
+            games_df.to_csv(csv_file, index=False)
+    # Games of jobs that have since been removed from the config
+    for filename in os.listdir(RECONSTRUCTED_DIR):
+        if filename.endswith(".csv") and os.path.join(RECONSTRUCTED_DIR, filename) not in paths.values():
+            os.remove(os.path.join(RECONSTRUCTED_DIR, filename))
+    save_manifest(manifest_path, fingerprints)
+    return [read_reconstructed_games(paths[job.name]) for job, _ in runnable]
+
+
+def read_reconstructed_games(path: str) -> pd.DataFrame:
+    try:
+        return pd.read_csv(path, dtype={"post_id": str}, parse_dates=["date"])
+    except pd.errors.EmptyDataError:
+        # The job found no games
+        return pd.DataFrame()
+
+
+def run_reconstruction_jobs(workers: int = 1, reconstruction: str = "greedy") -> None:
+    # Runs the reconstruction jobs on their own, over the cached posts, so a changed job can be checked without
+    # rebuilding every game. get_all_games picks up their saved games
+    logger.info("Running reconstruction jobs")
+    jobs = load_jobs()
+    job_posts = [[] for _ in jobs]
+    for _ in select_job_posts(iter_post_records("data/pages", workers), jobs, job_posts):
+        pass
+    reconstruct_games(jobs, job_posts, reconstruction, workers)
+    logger.info("Ran reconstruction jobs")
+
+
+def get_all_games(workers: int = 1, incremental: bool = False, reconstruction: str = "greedy",
+                  page_urls: list = None) -> None:
     logger.info("Getting all games")
-    page_dir = "data/pages"
-    blog_posts = []
-    games = []
-    for file in os.listdir(page_dir):
-        filename = os.fsdecode(file)
-        filepath = os.path.join(page_dir, filename)
-        page = Page(None, filepath)
-        # page = Page(None, "data/pages/page28.html")
-        page.get_blog_posts("local")
-        for bp in page.blog_posts:
-            blog_posts.append(bp)
-            for g in bp.games:
-                game = {
-                    "home_team": g.home_team,
-                    "away_team": g.away_team,
-                    "home_score": g.home_score,
-                    "away_score": g.away_score,
-                    "filepath": g.filepath,
-                    "post_title": bp.title,
-                    "date": g.date,
-                    "season": g.season,
-                    "competition": g.competition
-                }
-                games.append(game)
-        logger.info(f"{filename} complete")
-    games_df = pd.DataFrame(games)
-    missing_games_14_15_1 = [bp for bp in blog_posts if bp.title in ["Position", "Week 2 - Two perfect records survive.",
-                                                         "Week 3 - Three teams go three games undefeated.",
-                                                         "Week 4: Especially four you."]
-                  and bp.season == "2014/15"]
-    missing_games_14_15_1 = compute_missing_games(missing_games_14_15_1, True)
-    games_df = pd.concat([games_df, missing_games_14_15_1])
-    missing_games_14_15_2 = [bp for bp in blog_posts if
-                             bp.title in ["Week 14 - Crawling to the finish line", "Final Table"]
-                             and bp.season == "2014/15"]
-    missing_games_14_15_2 = compute_missing_games(missing_games_14_15_2, False)
-    games_df = pd.concat([games_df, missing_games_14_15_2])
-    games_df.to_csv("data/games/games.csv", index=False)
+    games_path = "data/games/games.csv"
+    manifest_path = "data/games/manifest.json"
+    page_hashes = get_page_hashes(get_page_filepaths("data/pages")) if page_urls is None else {}
+    manifest = load_manifest(manifest_path)
+    store = GameStore()
+    jobs = load_jobs()
+    job_definitions = {job.name: {"season": job.season, "fingerprint": get_job_fingerprint(job, [], reconstruction)}
+                       for job in jobs}
+    changed_posts = None
+    if incremental and "reconstructed_games" in manifest and store.exists() and page_urls is None:
+        changed, removed = get_changed_pages(page_hashes, manifest)
+        logger.info(f"{len(changed)} pages are new or have changed, {len(removed)} pages have been removed")
+        changed_posts = get_post_records("data/pages", workers, changed)
+        # Table-diff reconstruction needs every post of its season, so when a job or one of its seasons has changed the
+        # games are rebuilt from the cached posts. The seasons of jobs that have since been removed count too, to drop
+        # the games those jobs added
+        old_definitions = manifest.get("reconstruction_jobs", {})
+        reconstructed_seasons = {job.season for job in jobs} | {d["season"] for d in old_definitions.values()}
+        if old_definitions != job_definitions or any(bp.season in reconstructed_seasons for bp in changed_posts):
+            logger.info("Reconstruction jobs or the seasons they cover have changed, rebuilding every game")
+            changed_posts = None
+    if changed_posts is not None:
+        # The reconstructed games are unchanged and, as in a full run, come after the games of every post
+        n_reconstructed = manifest["reconstructed_games"]
+        games_df = store.read()
+        n_post_games = len(games_df) - n_reconstructed
+        post_games_df = merge_games(games_df.iloc[:n_post_games], get_games_from_posts(changed_posts),
+                                    [bp.post_id for bp in changed_posts], changed + removed, list(page_hashes))
+        store.write(pd.concat([post_games_df, games_df.iloc[n_post_games:]], ignore_index=True))
+    else:
+        # Posts stream from the pages to the store a chunk of games at a time. Only the posts the reconstruction
+        # jobs pick are kept until the end
+        job_posts = [[] for _ in jobs]
+        blog_posts = select_job_posts(iter_post_records("data/pages", workers, page_urls=page_urls), jobs, job_posts)
+        reconstructed = []
+
+        def get_all_chunks():
+            yield from get_game_chunks(blog_posts)
+            # Every post has been seen by now
+            reconstructed.extend(reconstruct_games(jobs, job_posts, reconstruction, workers))
+            yield from reconstructed
+
+        store.write(get_all_chunks())
+        n_reconstructed = sum(len(games_df) for games_df in reconstructed)
+    # Kept for the site importer
+    store.export_csv(games_path)
+    if page_urls is None:
+        save_manifest(manifest_path, {"parser_version": get_parser_version(), "pages": page_hashes,
+                                      "reconstruction_jobs": job_definitions, "reconstructed_games": n_reconstructed})
     logger.info("Got all games")
 
 
-def get_final_table_all_seasons() -> None:
+def get_final_table_all_seasons(workers: int = 1, page_urls: list = None) -> None:
     logger.info("Getting final tables")
-    page_dir = "data/pages"
-    blog_posts = []
-    tables = []
-    for file in os.listdir(page_dir):
-        filename = os.fsdecode(file)
-        filepath = os.path.join(page_dir, filename)
-        page = Page(None, filepath)
-        page.get_blog_posts("local")
-        for bp in page.blog_posts:
-            blog_posts.append(bp)
-            if bp.table is not None:
-                tables.append({"date": bp.date,
-                               "season": bp.season,
-                               "table": bp.table})
-        logger.info(f"{filename} complete")
+    tables = [{"date": r.date, "season": r.season, "table": r.table}
+              for r in iter_post_records("data/pages", workers, page_urls=page_urls)
+              if not r.is_unneeded_post and r.table is not None]
     tables_df = pd.DataFrame(tables)
     tables_df = tables_df[tables_df.groupby("season")["date"].transform("max") == tables_df["date"]]
     tables_df = tables_df.drop_duplicates(["date", "season"])
@@ -100,61 +242,131 @@ def get_final_table_all_seasons() -> None:
     logger.info("Got all final tables")
 
 
-def get_cup_participants() -> None:
+def get_cup_participants(workers: int = 1, page_urls: list = None) -> None:
     logger.info("Getting cup participants")
-    page_dir = "data/pages"
-    cup_participants = []
-    for file in os.listdir(page_dir):
-        filename = os.fsdecode(file)
-        filepath = os.path.join(page_dir, filename)
-        page = Page(None, filepath)
-        blog_posts = page.get_cup_posts("local")
-        for bp in blog_posts:
-            cup_participants.append(bp.get_cup_participants())
-        logger.info(f"{filename} complete")
+    cup_participants = [{"season": r.season, "teams": r.cup_participants}
+                        for r in iter_post_records("data/pages", workers, page_urls=page_urls) if r.is_cup_draw]
     cup_participants = [c for c in cup_participants if c["teams"]]
     logger.info("Got all cup participants")
 
 
-def get_games_by_season() -> None:
-    games_df = pd.read_csv("data/games/games.csv")
-    missing_games_df = pd.read_csv("data/games/missing_games.csv")
-    corrected_games_df = pd.read_csv("data/games/corrected_games.csv")
-    games_df = pd.concat([games_df, missing_games_df])
-    games_df = games_df.set_index(["home_team", "away_team", "season", "competition"])
-    corrected_games_df = corrected_games_df.set_index(["home_team", "away_team", "season", "competition"])
-    games_df.update(corrected_games_df)
-    games_df.reset_index(inplace=True)
+def get_games_by_season(incremental: bool = False, strict_team_names: bool = False, reconcile_weekly: bool = False,
+                        fail_on_discrepancy: bool = False, workers: int = 1, timing: bool = False) -> None:
+    start = time.perf_counter()
+    overlays = OverlayStack.load()
+    games_by_season = get_league_games_by_season(get_game_store())
+    dropouts = load_season_configs("data/dropouts", ".csv", load_dropouts)
+    forced_pseudonyms = load_season_configs("data/pseudonyms", ".yml", load_forced_pseudonyms)
     page_dir = "data/final_tables"
+    manifest_path = "data/finalised_games/manifest.json"
+    manifest = load_manifest(manifest_path) if incremental else {}
+    fingerprints = {}
+    team_name_index = TeamNameIndex(TEAM_NAMES_CACHE_PATH)
+    weekly_tables = get_weekly_tables() if reconcile_weekly else {}
+    skipped_seasons = []
     seasons = []
     for file in os.listdir(page_dir):
         filename = os.fsdecode(file)
         filepath = os.path.join(page_dir, filename)
         season_name = Path(filename).stem.replace('_', '/')
         df = pd.read_csv(filepath)
-        season_games = games_df[(games_df['season'] == season_name) & (games_df["competition"] == "league")]
-        season = Season(season_name, df, season_games)
-        season.fix_team_name_variation()
-        season.drop_dropouts()
-        season.remove_void_games()
-        season.fix_duplicate_missing_games()
-        season.play_season()
-        seasons.append(season)
-
-
-def find_missing_games() -> None:
-    games_df = pd.read_csv("data/games/games.csv")
+        season_games = overlays.apply(season_name, games_by_season[season_name])
+        fingerprints[season_name] = get_season_fingerprint(season_games, df, get_season_config_paths(season_name))
+        if manifest.get(season_name) == fingerprints[season_name] and \
+                os.path.isfile(f"data/finalised_games/{season_name.replace('/', '-')}.csv"):
+            logger.info(f"{season_name} is unchanged, skipping")
+            skipped_seasons.append(season_name)
+            continue
+        seasons.append(Season(season_name, df, season_games, team_name_index=team_name_index, overlays=overlays,
+                              dropouts=dropouts.get(season_name, []),
+                              forced_pseudonyms=forced_pseudonyms.get(season_name, {})))
+    startup_seconds = time.perf_counter() - start
+    season_seconds = {}
+
+    def timed_play_season(season):
+        season_start = time.perf_counter()
+        report = play_season(season, strict_team_names, reconcile_weekly, weekly_tables.get(season.season_name))
+        season_seconds[season.season_name] = time.perf_counter() - season_start
+        return report
+
+    # Seasons are independent of each other. Threads rather than processes so they can share the team name index
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        reports = list(executor.map(timed_play_season, seasons))
+    if timing:
+        logger.info(f"Loading games and config took {startup_seconds:.3f}s\n" +
+                    "".join(f"{season_name} took {seconds:.3f}s\n" for season_name, seconds in season_seconds.items())
+                    + get_timing_report())
+    team_name_index.save()
+    save_manifest(manifest_path, fingerprints)
+    report = save_report(reports, kept_seasons=skipped_seasons)
+    if fail_on_discrepancy and not report.empty:
+        raise RuntimeError(f"The computed tables differ from the published ones in {len(report)} places, see "
+                           f"{REPORT_PATH}")
+
+
+def play_season(season: Season, strict_team_names: bool = False, reconcile_weekly: bool = False,
+                weekly_tables: list = None) -> pd.DataFrame:
+    season.fix_team_name_variation(strict_team_names)
+    season.drop_dropouts()
+    season.remove_void_games()
+    season.fix_duplicate_missing_games()
+    season.play_season()
+    return reconcile_season(season.season_name, season.table, season.final_table, season.team_aliases,
+                            season.get_table_snapshots() if reconcile_weekly else None, weekly_tables)
+
+
+def get_league_games_by_season(store: GameStore) -> defaultdict:
+    # The store is read and split by season once rather than filtered again for every season
+    games_df = store.read()
+    games_by_season = defaultdict(lambda: games_df.iloc[:0])
+    for (season_name, competition), season_games in games_df.groupby(["season", "competition"], observed=True,
+                                                                     sort=False):
+        if competition == "league":
+            games_by_season[season_name] = season_games
+    return games_by_season
+
+
+def get_game_store() -> GameStore:
+    store = GameStore()
+    if not store.exists() and os.path.isfile("data/games/games.csv"):
+        # Games extracted before there was a store are only in the CSV export
+        store.write(pd.read_csv("data/games/games.csv", dtype={"post_id": str}))
+    return store
+
+
+def get_weekly_tables() -> dict:
+    # (date, title, table) of every table posted during each season
+    weekly_tables = {}
+    for r in iter_post_records("data/pages"):
+        if not r.is_unneeded_post and r.table is not None and "Team" in r.table:
+            weekly_tables.setdefault(r.season, []).append((r.date, r.title, r.table))
+    return weekly_tables
+
+
+def get_season_config_paths(season_name: str) -> list:
+    return [os.path.join("data/dropouts", season_name.replace('/', '_') + '.csv'),
+            os.path.join("data/pseudonyms", season_name.replace('/', '_') + '.yml'),
+            "data/games/void_games.csv",
+            "data/match_site_names/match_site_names.yml"]
+
+
+def find_missing_games(strict_team_names: bool = False) -> None:
+    games_by_season = get_league_games_by_season(get_game_store())
+    dropouts = load_season_configs("data/dropouts", ".csv", load_dropouts)
+    forced_pseudonyms = load_season_configs("data/pseudonyms", ".yml", load_forced_pseudonyms)
     page_dir = "data/final_tables"
-    seasons = []
+    team_name_index = TeamNameIndex(TEAM_NAMES_CACHE_PATH)
     for file in os.listdir(page_dir):
         filename = os.fsdecode(file)
         filepath = os.path.join(page_dir, filename)
         season_name = Path(filename).stem.replace('_', '/')
         df = pd.read_csv(filepath)
-        season_games = games_df[(games_df['season'] == season_name) & (games_df["competition"] == "league")]
-        season = Season(season_name, df, season_games)
-        season.fix_team_name_variation()
+        season = Season(season_name, df, games_by_season[season_name], team_name_index=team_name_index,
+                        dropouts=dropouts.get(season_name, []),
+                        forced_pseudonyms=forced_pseudonyms.get(season_name, {}))
+        season.fix_team_name_variation(strict_team_names)
         season.find_missing_games()
+    team_name_index.save()
 
 
 if __name__ == "__main__":
@@ -164,6 +376,7 @@ if __name__ == "__main__":
                             "get_all_pages",
                             "get_all_players",
                             "get_all_games",
+                            "reconstruct_games",
                             "get_all_final_tables",
                             "play_seasons",
                             "get_cup_participants",
@@ -171,20 +384,52 @@ if __name__ == "__main__":
                         ])
     parser.add_argument("-b", type=str, default="http://hanoiinternationalfootballleague.blogspot.com/",
                         dest="blog_url", help="URL of the blog to operate on")
+    parser.add_argument("--workers", type=int, default=1, dest="workers",
+                        help="Number of processes to parse pages with, or threads to play seasons with")
+    parser.add_argument("--incremental", action="store_true", dest="incremental",
+                        help="Only process pages and seasons that have changed since the last run")
+    parser.add_argument("--reconstruction", type=str, default="greedy", dest="reconstruction",
+                        choices=["greedy", "exact"],
+                        help="How games missing from the blog are rebuilt from league table differences. \"exact\" "
+                             "considers every pairing and adds confidence and ambiguous columns")
+    parser.add_argument("--profile-text", action="store_true", dest="profile_text",
+                        help="Report the time spent converting posts to text on each page")
+    parser.add_argument("--reconcile-weekly", action="store_true", dest="reconcile_weekly",
+                        help="Also compare every table posted during a season with the table played out to its date")
+    parser.add_argument("--fail-on-discrepancy", action="store_true", dest="fail_on_discrepancy",
+                        help="Fail if a computed table differs from the published one")
+    parser.add_argument("--offline", action="store_true", dest="offline",
+                        help="Only use Google Sheets tables that have already been downloaded")
+    parser.add_argument("--from-web", action="store_true", dest="from_web",
+                        help="Fetch and parse pages straight from the blog, many at once, instead of the saved pages")
+    parser.add_argument("--timing", action="store_true", dest="timing",
+                        help="Report the time spent loading games and config and playing each season")
+    parser.add_argument("--strict-team-names", action="store_true", dest="strict_team_names",
+                        help="Fail if a team string in a season's games doesn't map to exactly one team")
     args = parser.parse_args()
 
     configure_logging('logging_config.json')
+    if args.offline:
+        sheets.configure(offline=True)
     blog = Blog(args.blog_url)
+    # Only worked out for the operations that read pages, as it can mean following every page's older link
+    page_urls = get_page_urls(blog, "data/pages") if args.from_web and args.operation in PAGE_OPERATIONS else None
+
+    if args.profile_text:
+        profile_text_conversion("data/pages")
 
     if args.operation == 'get_all_pages':
         get_all_pages(blog)
     elif args.operation == "get_all_games":
-        get_all_games()
+        get_all_games(args.workers, args.incremental, args.reconstruction, page_urls)
+    elif args.operation == "reconstruct_games":
+        run_reconstruction_jobs(args.workers, args.reconstruction)
     elif args.operation == "get_all_final_tables":
-        get_final_table_all_seasons()
+        get_final_table_all_seasons(args.workers, page_urls)
     elif args.operation == "play_seasons":
-        get_games_by_season()
+        get_games_by_season(args.incremental, args.strict_team_names, args.reconcile_weekly,
+                            args.fail_on_discrepancy, args.workers, args.timing)
     elif args.operation == "get_cup_participants":
-        get_cup_participants()
+        get_cup_participants(args.workers, page_urls)
     elif args.operation == "find_missing_games":
-        find_missing_games()
\ No newline at end of file
+        find_missing_games(args.strict_team_names)
\ No newline at end of file
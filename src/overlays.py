@@ -0,0 +1,95 @@
+import logging
+import os
+
+import pandas as pd
+
+from src.config import load
+
+logger = logging.getLogger(__name__)
+
+GAMES_DIR = "data/games"
+FIXTURE_KEY = ["home_team", "away_team", "season", "competition"]
+# Applied in this order, each row of a season's games records the last layer that produced or changed it. Void games
+# are removed afterwards, so no row is left to record them
+LAYERS = ["base", "missing", "corrected"]
+
+
+def get_fixture_keys(games):
+    return pd.util.hash_pandas_object(games[FIXTURE_KEY].astype(str), index=False).to_numpy()
+
+
+class OverlayStack:
+    # Patches applied over the games scraped from the blog: games missing from the blog are added, corrections
+    # overwrite the scores of their fixture and void games are removed. The missing and corrected layers are read
+    # once and split by season, so resolving a season only touches that season's rows
+
+    def __init__(self, missing_games, corrected_games, void_games):
+        self.missing_games = self._by_season(missing_games)
+        self.corrected_games = {season: corrected.assign(fixture_key=get_fixture_keys(corrected))
+                                .drop_duplicates("fixture_key", keep="last").set_index("fixture_key")
+                                for season, corrected in self._by_season(corrected_games).items()}
+        self.void_games = void_games
+
+    @classmethod
+    def load(cls, games_dir=GAMES_DIR):
+        # Shared by every caller until one of the files changes, the stack is never modified once built
+        return load(tuple(os.path.join(games_dir, f) for f in ["missing_games.csv", "corrected_games.csv",
+                                                                "void_games.csv"]), cls._read)
+
+    @classmethod
+    def _read(cls, missing_games_path, corrected_games_path, void_games_path):
+        return cls(pd.read_csv(missing_games_path, parse_dates=["date"]), pd.read_csv(corrected_games_path),
+                   pd.read_csv(void_games_path))
+
+    @staticmethod
+    def _by_season(games):
+        return {season: season_games for season, season_games in games.groupby("season", sort=False)}
+
+    def apply(self, season_name, games, competition="league"):
+        # Base, missing and corrected layers. Void games are removed separately, once team names have been fixed
+        missing_games = self.missing_games.get(season_name, pd.DataFrame(columns=FIXTURE_KEY))
+        games = pd.concat([games.assign(source_layer="base"),
+                           missing_games[missing_games["competition"] == competition].assign(source_layer="missing")],
+                          ignore_index=True)
+        corrected_games = self.corrected_games.get(season_name)
+        if corrected_games is not None:
+            fixture_keys = get_fixture_keys(games)
+            corrected = pd.Series(fixture_keys).isin(corrected_games.index).to_numpy()
+            corrections = corrected_games.loc[fixture_keys[corrected]]
+            for column in corrections.columns.drop(FIXTURE_KEY):
+                # Like DataFrame.update, only values given in the correction overwrite the game's
+                values = corrections[column].to_numpy()
+                given = pd.notna(values)
+                if column not in games:
+                    games[column] = pd.NA
+                games.loc[games.index[corrected][given], column] = values[given]
+            games.loc[corrected, "source_layer"] = "corrected"
+        return games
+
+    def remove_void(self, games):
+        # A game is void when it agrees with a row of the void games on every column they have in common, so a row
+        # can name a single meeting of a fixture by its date or score, or a fixture in every season by leaving the
+        # season out
+        if self.void_games.empty:
+            return games
+        columns = [column for column in self.void_games.columns if column in games]
+        if not columns:
+            raise ValueError(f"Void games have none of the games' columns, they have {list(self.void_games.columns)}")
+        void_keys = set(self._get_keys(self.void_games, games, columns))
+        game_keys = self._get_keys(games, games, columns)
+        return games[~pd.Series(game_keys, index=games.index).isin(void_keys)]
+
+    @staticmethod
+    def _get_keys(rows, games, columns):
+        # The void games are read from a CSV, where a blank cell turns a column of scores into floats and dates are
+        # left as text. So each column is given the type of the games' column before hashing: scores are compared as
+        # numbers, dates as dates and everything else as text. A blank cell only matches a game without that value
+        typed = pd.DataFrame(index=rows.index)
+        for column in columns:
+            if pd.api.types.is_numeric_dtype(games[column]):
+                typed[column] = pd.to_numeric(rows[column], errors="coerce").astype("Float64")
+            elif pd.api.types.is_datetime64_any_dtype(games[column]):
+                typed[column] = pd.to_datetime(rows[column], errors="coerce")
+            else:
+                typed[column] = rows[column].astype("string")
+        return pd.util.hash_pandas_object(typed, index=False).to_numpy()
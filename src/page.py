@@ -4,7 +4,9 @@ import logging
 from datetime import datetime as dt
 from io import TextIOWrapper
 
-from blog_post import BlogPost
+from src.blog_post import BlogPost
+from src.page_scanner import scan_posts
+from src.post_classifier import load_classifier
 
 logger = logging.getLogger(__name__)
 
@@ -17,42 +19,59 @@ class Page:
         self.blog_posts = []
 
     def get_blog_posts(self, data_from="web"):
+        html_data = self._get_html_data(data_from)
+        self._get_blog_posts_inner(html_data)
+
+    def get_all_posts(self, data_from="web"):
+        # Every post on the page, including unneeded ones, so a single parse can serve all operations
+        html_data = self._get_html_data(data_from)
+        return self._get_all_posts_inner(html_data)
+
+    def _get_html_data(self, data_from):
         if data_from == "web":
             if self.url:
-                html_data = requests.get(self.url).content
+                return requests.get(self.url).content
             else:
                 raise ValueError("No url provided")
         elif data_from == "local":
             if self.filepath:
-                html_data = open(self.filepath)
+                return open(self.filepath)
             else:
                 raise ValueError("No filepath provided")
         else:
             raise ValueError("Invalid operation selected")
-        self._get_blog_posts_inner(html_data)
 
     def _get_blog_posts_inner(self, html_data):
         blog_posts = []
-        soup = BeautifulSoup(html_data, 'html.parser')
-        for date_outer in soup.find_all("div", class_="date-outer"):
-            date = self.get_date(date_outer)
-            season = self.get_season(date)
-            for post_outer in date_outer.find_all("div", class_="post-outer"):
-                blog_post = BlogPost(self.url, self.filepath, post_outer, date, season).prepare(False)
-                if not blog_post.is_unneeded_post:
-                    blog_posts.append(blog_post)
-                    logger.debug([(g.home_team, g.home_score, g.away_score, g.away_team) for g in
-                                  blog_posts[-1].games])
+        for blog_post in self._get_all_posts_inner(html_data):
+            if not blog_post.is_unneeded_post:
+                blog_posts.append(blog_post)
+                logger.debug([(g.home_team, g.home_score, g.away_score, g.away_team) for g in
+                              blog_posts[-1].games])
         self.blog_posts = blog_posts
 
-        if isinstance(html_data, TextIOWrapper):
-            html_data.close()
+    def _get_all_posts_inner(self, html_data):
+        # Posts are yielded as they're scanned and only one post's markup is turned into a soup at a time, so a caller
+        # that's done with each post before asking for the next never holds more than one post tree
+        try:
+            for date_header, post_html in scan_posts(html_data):
+                date = self.parse_date(date_header)
+                season = self.get_season(date)
+                post_outer = BeautifulSoup(post_html, 'html.parser').div
+                yield BlogPost(self.url, self.filepath, post_outer, date, season).prepare(False)
+        finally:
+            if isinstance(html_data, TextIOWrapper):
+                html_data.close()
 
     @staticmethod
     def get_date(soup):
         return dt.strptime(list(list(soup.find_all("h2", class_="date-header")[0].children)[0].children)[0],
                            '%A, %B %d, %Y')
 
+    @staticmethod
+    def parse_date(date_header):
+        return dt.strptime(date_header, '%A, %B %d, %Y')
+
     @staticmethod
     def get_season(date):
         year = date.year
@@ -63,34 +82,19 @@ class Page:
             return str(year) + "/" + str(year + 1)[-2:]
 
     def get_cup_posts(self, data_from="web"):
-        if data_from == "web":
-            if self.url:
-                html_data = requests.get(self.url).content
-            else:
-                raise ValueError("No url provided")
-        elif data_from == "local":
-            if self.filepath:
-                html_data = open(self.filepath)
-            else:
-                raise ValueError("No filepath provided")
-        else:
-            raise ValueError("Invalid operation selected")
+        html_data = self._get_html_data(data_from)
         return self._get_cup_posts_inner(html_data)
 
     def _get_cup_posts_inner(self, html_data):
         blog_posts = []
-        soup = BeautifulSoup(html_data, 'html.parser')
-        for date_outer in soup.find_all("div", class_="date-outer"):
-            date = self.get_date(date_outer)
-            season = self.get_season(date)
-            for post_outer in date_outer.find_all("div", class_="post-outer"):
-                blog_post = BlogPost(self.url, self.filepath, post_outer, date, season).prepare(False)
-                if "cup" in blog_post.title.lower() and "draw" in blog_post.title.lower():
-                    blog_posts.append(blog_post)
-                    logger.debug([(g.home_team, g.home_score, g.away_score, g.away_team) for g in
-                                  blog_posts[-1].games])
-
-        if isinstance(html_data, TextIOWrapper):
-            html_data.close()
+        for blog_post in self._get_all_posts_inner(html_data):
+            if is_cup_draw_title(blog_post.title):
+                blog_posts.append(blog_post)
+                logger.debug([(g.home_team, g.home_score, g.away_score, g.away_team) for g in
+                              blog_posts[-1].games])
 
         return blog_posts
+
+
+def is_cup_draw_title(title):
+    return "cup_draw" in load_classifier().classify(title)
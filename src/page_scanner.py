@@ -0,0 +1,95 @@
+import html
+from html.parser import HTMLParser
+
+from bs4 import UnicodeDammit
+
+
+class PostScanner(HTMLParser):
+    # Scans a page's markup as a stream of tags, only keeping the raw markup of the post-outer div currently being
+    # read. Each finished post is queued with the date header of the date-outer div that contains it
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.posts = []
+        self._div_depth = 0
+        self._date_outer_depth = None
+        self._post_outer_depth = None
+        self._date_header = None
+        self._date_header_parts = None
+        self._fragment = None
+
+    def handle_starttag(self, tag, attrs):
+        self._record(self.get_starttag_text())
+        classes = (dict(attrs).get("class") or "").split()
+        if tag == "div":
+            self._div_depth += 1
+            if "date-outer" in classes and self._date_outer_depth is None:
+                self._date_outer_depth = self._div_depth
+                self._date_header = None
+            elif "post-outer" in classes and self._date_outer_depth is not None and self._post_outer_depth is None:
+                self._post_outer_depth = self._div_depth
+                self._fragment = [self.get_starttag_text()]
+        elif tag == "h2" and "date-header" in classes and self._date_outer_depth is not None:
+            self._date_header_parts = []
+
+    def handle_startendtag(self, tag, attrs):
+        self._record(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        self._record(f"</{tag}>")
+        if tag == "div" and self._div_depth > 0:
+            if self._div_depth == self._post_outer_depth:
+                self.posts.append((self._date_header, "".join(self._fragment)))
+                self._post_outer_depth = None
+                self._fragment = None
+            elif self._div_depth == self._date_outer_depth:
+                self._date_outer_depth = None
+            self._div_depth -= 1
+        elif tag == "h2" and self._date_header_parts is not None:
+            self._date_header = html.unescape("".join(self._date_header_parts)).strip()
+            self._date_header_parts = None
+
+    def handle_data(self, data):
+        self._record(data)
+        if self._date_header_parts is not None:
+            self._date_header_parts.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name):
+        self.handle_data(f"&#{name};")
+
+    def handle_comment(self, data):
+        self._record(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._record(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._record(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._record(f"<![{data}]>")
+
+    def _record(self, markup):
+        if self._fragment is not None:
+            self._fragment.append(markup)
+
+
+def scan_posts(html_data, chunk_size=65536):
+    # Yields (date header, post-outer markup) for every post on a page, reading the page a chunk at a time so only
+    # one post's markup is held in memory
+    if isinstance(html_data, bytes):
+        html_data = UnicodeDammit(html_data).unicode_markup
+    scanner = PostScanner()
+    if isinstance(html_data, str):
+        chunks = (html_data[i:i + chunk_size] for i in range(0, len(html_data), chunk_size))
+    else:
+        chunks = iter(lambda: html_data.read(chunk_size), "")
+    for chunk in chunks:
+        scanner.feed(chunk)
+        yield from scanner.posts
+        scanner.posts.clear()
+    scanner.close()
+    yield from scanner.posts
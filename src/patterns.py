@@ -0,0 +1,37 @@
+import re
+from functools import lru_cache
+
+# Compiled once at import rather than looked up from re's cache on every call
+
+# BlogPost
+TITLE_LINE = re.compile(r"[a-zA-Z]")
+HYPERLINK = re.compile(r"\[((?:[^\[]|\n?)*?)(?:\])\(((?:.|\n)*?)\)")
+WEEK = re.compile(r"Week \b[A-Za-z]+\b")
+LEAGUE_DAY_HEADING = re.compile(r"day \d{1,2}")
+# e.g., "Drink 4-1 Roots (Ben 40'; Baptiste 5')"
+GAME = re.compile(r"(?: *\d. *)?((.*?) ([\d]{1,2}) {0,2}[–-] {0,2}([\d]{1,2}).? (.+?)(?:$|\()(?:(.+)\))?)", re.MULTILINE)
+# e.g., "HSS 0 – Drink 7"
+GAME_SCORE_AFTER_TEAM = re.compile(r"(?: *\d. *)?((.*?) ([\d]{1,2}) ?[–-] ?(.+?) ([\d]{1,2}))(?: *\n)")
+AGG_SCORE = re.compile(r" \(agg [\d]{1,2}-[\d]{1,2}\)")
+AGG_SCORE_IN_SCORERS = re.compile(r"\) \(agg [\d]{1,2}-[\d]{1,2}")
+CUP_FIXTURE = re.compile(r"(?:[\d]{1,2}). (.*) vs. (.*)")
+
+# Game
+TEAM_NAME = re.compile(r"([^()]*)( (\((.*)\)))?")
+LIST_NUMBER = re.compile(r"\d. ")
+SCORER_SEPARATOR = re.compile(r",(?![^\(\[]*[\]\)])")
+MULTIPLE_GOALS_X = re.compile(r"(.*)x *([\d]+)")
+MULTIPLE_GOALS_BRACKET = re.compile(r"(.*)\((.*)\)")
+GENERIC_SCORERS = (re.compile(r"Goals: (.*):(.*);( (.*):(.*).)?"),
+                   re.compile(r"Goals: (.*):(.*)\.(.*)(.*)(.*)"),
+                   re.compile(r"Goals: (.*):(.*)(.*)(.*)(.*)"))
+
+
+@lru_cache(maxsize=None)
+def get_scorer_patterns(home_team, away_team):
+    # Goals string patterns in the order they should be tried. The team specific ones are only built once per pair of
+    # teams, with the team names escaped so that characters like "." or "(" in a name are matched literally
+    home_team, away_team = re.escape(home_team), re.escape(away_team)
+    return (re.compile(f"Goals: ({home_team}):?([^;]*);? ?(?:({away_team}):?(.*))"),
+            *GENERIC_SCORERS,
+            re.compile(f"Goals: ({home_team})(.*)(({away_team})(.*))"))
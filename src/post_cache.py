@@ -0,0 +1,175 @@
+import hashlib
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from src import sheets
+from src.async_fetch import AsyncFetcher
+from src.config import load
+from src.files import atomic_write
+from src.page import Page, is_cup_draw_title
+from src.post_classifier import CLASSIFICATION_PATH
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to the parsing code would change the records it produces, so that every cached page gets
+# parsed again on the next run
+PARSER_VERSION = 4
+GAME_COLUMNS = ["home_team", "away_team", "home_score", "away_score", "filepath", "post_title", "date", "season",
+                "competition", "post_id", "game_index"]
+
+
+class GameRecord(NamedTuple):
+    # Only what differs between a post's games, the rest of a game's columns come from its post
+    home_team: str
+    away_team: str
+    home_score: int
+    away_score: int
+    date: object
+    season: str
+    competition: str
+
+
+class PostRecord:
+    # What's left of a BlogPost once everything has been extracted from its HTML. diff_table is set by the table
+    # difference reconstruction
+    __slots__ = ("filepath", "post_id", "title", "date", "season", "week", "table", "games", "is_unneeded_post",
+                 "cup_participants", "diff_table")
+
+    def __init__(self, filepath, post_id, title, date, season, week, table, games, is_unneeded_post,
+                 cup_participants=None):
+        self.filepath = filepath
+        self.post_id = post_id
+        self.title = title
+        self.date = date
+        self.season = season
+        self.week = week
+        self.table = table
+        self.games = games
+        self.is_unneeded_post = is_unneeded_post
+        self.cup_participants = cup_participants
+        self.diff_table = None
+
+    @classmethod
+    def from_blog_post(cls, blog_post):
+        games = tuple(GameRecord(g.home_team, g.away_team, g.home_score, g.away_score, g.date, g.season, g.competition)
+                      for g in blog_post.games)
+        record = cls(blog_post.filepath, blog_post.post_id, blog_post.title, blog_post.date, blog_post.season,
+                     blog_post.week, blog_post.table, games, blog_post.is_unneeded_post)
+        if record.is_cup_draw:
+            record.cup_participants = blog_post.get_cup_participants()["teams"]
+        # Nothing else is read from the post's HTML, so its soup and text can be freed while the record lives on
+        blog_post.release_html()
+        return record
+
+    @property
+    def is_cup_draw(self):
+        return is_cup_draw_title(self.title)
+
+    def set_filepath(self, filepath):
+        self.filepath = filepath
+
+
+def get_game_columns(records):
+    # {column: values} for every game of the given posts, filled column by column rather than one dict per game
+    columns = {column: [] for column in GAME_COLUMNS}
+    for record in records:
+        n_games = len(record.games)
+        if not n_games:
+            continue
+        for column, values in zip(GameRecord._fields, zip(*record.games)):
+            columns[column].extend(values)
+        for column, value in [("filepath", record.filepath), ("post_title", record.title),
+                              ("post_id", record.post_id)]:
+            columns[column].extend([value] * n_games)
+        columns["game_index"].extend(range(n_games))
+    # Given as an object array, pandas infers datetimes from it without checking whether each date is a sequence
+    columns["date"] = np.fromiter(columns["date"], dtype=object, count=len(columns["date"]))
+    return columns
+
+
+class PostCache:
+
+    def __init__(self, cache_dir="data/cache/posts"):
+        self.cache_dir = cache_dir
+
+    def get_records(self, filepath):
+        with open(filepath, "rb") as page_file:
+            content = page_file.read()
+        cache_path = os.path.join(self.cache_dir, self.get_key(content) + ".pkl")
+        if os.path.isfile(cache_path):
+            with open(cache_path, "rb") as cache_file:
+                records = pickle.load(cache_file)
+            logger.debug(f"Loaded {filepath} from {cache_path}")
+        else:
+            # Each post's record is built, and its HTML released, before the next post is parsed
+            records = [PostRecord.from_blog_post(bp) for bp in Page(None, filepath).get_all_posts("local")]
+            self._save(cache_path, records)
+            logger.debug(f"Parsed {filepath} and cached it to {cache_path}")
+        # Pages with identical content share a cache entry, so make sure the records point at this page
+        for record in records:
+            record.set_filepath(filepath)
+        return records
+
+    @staticmethod
+    def get_key(content):
+        return hashlib.sha256(f"v{get_parser_version()}:".encode() + content).hexdigest()
+
+    @staticmethod
+    def _save(cache_path, records):
+        with atomic_write(cache_path, "wb") as cache_file:
+            pickle.dump(records, cache_file)
+
+
+def get_file_hash(filepath):
+    with open(filepath, "rb") as page_file:
+        return hashlib.sha256(page_file.read()).hexdigest()
+
+
+def get_parser_version():
+    # Which posts are skipped is configured, so records parsed under another configuration are out of date too. Called
+    # for every page, so the file is only hashed again once it has been modified
+    return f"{PARSER_VERSION}:{load(CLASSIFICATION_PATH, get_file_hash)[:16]}"
+
+
+def get_page_filepaths(page_dir):
+    return [os.path.join(page_dir, os.fsdecode(file)) for file in sorted(os.listdir(page_dir))
+            if os.fsdecode(file).endswith(".html")]
+
+
+def load_records(filepaths, workers=1, cache_dir="data/cache/posts"):
+    # Pages are independent of each other, so parsing can be spread across a process pool. Results are yielded in the
+    # order of filepaths regardless of which worker finishes first, keeping the output identical to a serial run
+    if workers <= 1:
+        post_cache = PostCache(cache_dir)
+        for filepath in filepaths:
+            yield filepath, post_cache.get_records(filepath)
+        return
+    # Workers fetch embedded sheets with the same settings as this process, e.g., offline
+    with ProcessPoolExecutor(max_workers=workers, initializer=_configure_worker,
+                             initargs=(sheets.get_fetcher().get_settings(),)) as executor:
+        yield from zip(filepaths, executor.map(_get_page_records, filepaths, [cache_dir] * len(filepaths)))
+
+
+def _configure_worker(sheet_settings):
+    sheets.configure(**sheet_settings)
+
+
+def _get_page_records(filepath, cache_dir):
+    return PostCache(cache_dir).get_records(filepath)
+
+
+def fetch_records(urls, workers=1, fetcher=None):
+    # Pages straight from the blog rather than from data/pages. Each page is parsed as soon as it arrives while the
+    # rest are still downloading, and only its records come back from the parse worker
+    fetcher = fetcher or AsyncFetcher()
+    return list(zip(urls, fetcher.fetch_all(urls, _parse_web_page, workers, _configure_worker,
+                                            (sheets.get_fetcher().get_settings(),))))
+
+
+def _parse_web_page(url, content):
+    return [PostRecord.from_blog_post(bp) for bp in Page(url)._get_all_posts_inner(content)]
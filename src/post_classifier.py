@@ -0,0 +1,59 @@
+import logging
+import os
+import re
+
+import yaml
+
+from src.config import CONFIG_DIR, YAML_LOADER, load
+
+logger = logging.getLogger(__name__)
+
+CLASSIFICATION_PATH = os.path.join(CONFIG_DIR, "post_classification.yml")
+SKIP = "skip"
+
+
+class PostClassifier:
+    # Sorts post titles into categories in one pass: skipped titles are a set lookup and every category rule is an
+    # optional lookahead of one combined regex, so a single match tells every category a title belongs to. Titles
+    # repeat across pages, so each one is only classified once
+
+    def __init__(self, skip_titles, categories):
+        self.skip_titles = frozenset(skip_titles)
+        self.category_names = tuple(categories)
+        self.matcher = re.compile("".join(f"(?=(?P<{name}>.*?(?:{'|'.join(patterns)})))?"
+                                          for name, patterns in categories.items()), re.IGNORECASE | re.DOTALL)
+        self._classified = {}
+
+    def classify(self, title):
+        # The categories of the title, including SKIP for posts that should only have their title read
+        categories = self._classified.get(title)
+        if categories is None:
+            match = self.matcher.match(title or "")
+            categories = frozenset([name for name in self.category_names if match.group(name) is not None] +
+                                   ([SKIP] if title in self.skip_titles else []))
+            self._classified[title] = categories
+        return categories
+
+    def is_skipped(self, title):
+        return title in self.skip_titles
+
+
+def load_classifier(path=CLASSIFICATION_PATH):
+    return load(path, _parse_classifier)
+
+
+def _parse_classifier(path):
+    with open(path) as inputfile:
+        rules = yaml.load(inputfile, Loader=YAML_LOADER) or {}
+    skip_titles = rules.get(SKIP, []) if isinstance(rules, dict) else None
+    categories = rules.get("categories", {}) if isinstance(rules, dict) else None
+    if not isinstance(skip_titles, list) or not all(isinstance(t, str) for t in skip_titles):
+        raise ValueError(f"{path} should list the titles of skipped posts under {SKIP}")
+    if not isinstance(categories, dict) or \
+            not all(isinstance(k, str) and k.isidentifier() and k != SKIP and isinstance(v, list) and v and
+                    all(isinstance(p, str) for p in v) for k, v in categories.items()):
+        raise ValueError(f"{path} should map category names to lists of title patterns under categories")
+    try:
+        return PostClassifier(skip_titles, categories)
+    except re.error as e:
+        raise ValueError(f"{path} has an invalid title pattern: {e}")
@@ -0,0 +1,74 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.files import atomic_write
+from src.standings import STANDINGS_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+REPORT_PATH = "data/reconciliation/report.csv"
+REPORT_COLUMNS = ["season", "table", "date", "post_title", "Team", "column", "computed", "published", "difference"]
+STAT_COLUMNS = STANDINGS_COLUMNS[1:]
+# Column names used by the blog's tables and the Google Sheets ones, see BlogPost.get_table
+COLUMN_ALIASES = {"Played": "P", "Won": "W", "Draw": "D", "Drawn": "D", "Loss": "L", "Lost": "L", "GF": "F",
+                  "GA": "A", "Goal difference": "GD", "Points": "Pts"}
+
+
+def normalise_table(table, team_aliases=None):
+    # Published table with the standings column names, numeric stats and team names as used in the games
+    table = table.rename(columns=COLUMN_ALIASES)
+    table = table[[c for c in STANDINGS_COLUMNS if c in table]].copy()
+    table["Team"] = table["Team"].astype(str).str.replace(u'\xa0', u' ').str.replace("  ", " ")
+    if team_aliases:
+        table["Team"] = table["Team"].map(team_aliases).fillna(table["Team"])
+    for column in table.columns.drop("Team"):
+        table[column] = pd.to_numeric(table[column], errors="coerce")
+    return table
+
+
+def compare_tables(computed, published, keys, how):
+    # One row per team and column that differ, including teams that are only in one of the tables
+    columns = [c for c in STAT_COLUMNS if c in published and c in computed]
+    computed = computed.melt(id_vars=keys, value_vars=columns, var_name="column", value_name="computed")
+    published = published.melt(id_vars=[c for c in published if c not in STAT_COLUMNS], value_vars=columns,
+                               var_name="column", value_name="published")
+    merged = computed.merge(published, on=keys + ["column"], how=how)
+    merged["difference"] = merged["computed"] - merged["published"]
+    return merged[merged["computed"].to_numpy() != merged["published"].to_numpy()]
+
+
+def reconcile_season(season_name, table, final_table, team_aliases=None, snapshots=None, weekly_tables=None):
+    # Compares the table played out from a season's games with its published final table and, when snapshots are
+    # given, each of its weekly tables with the computed table as of that table's date
+    report = compare_tables(table, normalise_table(final_table, team_aliases), ["Team"], "outer")
+    report = report.assign(table="final", date=pd.NaT, post_title="")
+    if snapshots is not None and weekly_tables:
+        published = pd.concat([normalise_table(t, team_aliases).assign(date=pd.to_datetime(date), post_title=title)
+                               for date, title, t in weekly_tables], ignore_index=True)
+        snapshot_dates = pd.DataFrame({"snapshot_date": np.sort(snapshots["date"].unique())})
+        # Each weekly table is compared with the last snapshot on or before its date
+        published = pd.merge_asof(published.sort_values("date"), snapshot_dates, left_on="date",
+                                  right_on="snapshot_date")
+        computed = snapshots.rename(columns={"date": "snapshot_date"})
+        weekly_report = compare_tables(computed, published, ["snapshot_date", "Team"], "right")
+        # Tables posted before the first game was played are compared with an empty table
+        weekly_report = weekly_report[~(weekly_report["snapshot_date"].isna() & (weekly_report["published"] == 0))]
+        report = pd.concat([report, weekly_report.assign(table="weekly")], ignore_index=True)
+    return report.assign(season=season_name)[REPORT_COLUMNS]
+
+
+def save_report(reports, report_path=REPORT_PATH, kept_seasons=()):
+    # Rows for seasons that weren't reconciled this run are kept from the previous report
+    reports = list(reports)
+    if kept_seasons and os.path.isfile(report_path):
+        previous = pd.read_csv(report_path)
+        reports.insert(0, previous[previous["season"].isin(kept_seasons)])
+    report = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=REPORT_COLUMNS)
+    with atomic_write(report_path, newline="") as report_file:
+        report.to_csv(report_file, index=False)
+    for season_name, season_report in report.groupby("season"):
+        logger.warning(f"{season_name}: {len(season_report)} differences between the computed and published tables")
+    return report
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import NamedTuple
+
+import pandas as pd
+import yaml
+
+from src.compute_missing_games import compute_missing_games, reconstruct_missing_games
+from src.config import CONFIG_DIR, YAML_LOADER, load
+
+logger = logging.getLogger(__name__)
+
+JOBS_PATH = os.path.join(CONFIG_DIR, "reconstruction_jobs.yml")
+RECONSTRUCTIONS = {"greedy": compute_missing_games, "exact": reconstruct_missing_games}
+# Job names are used as file names
+JOB_NAME = re.compile(r"[\w.-]+")
+
+
+class ReconstructionJob(NamedTuple):
+    # Rebuilds games from the differences between the tables of the season's posts titled exactly as one of the
+    # titles. With include_first, the first table is taken as a difference from an empty table. Without a mode, the
+    # run's reconstruction is used
+    name: str
+    season: str
+    titles: tuple
+    include_first: bool = False
+    mode: str = None
+
+    def picks(self, post):
+        # Only posts with a table can be reconstructed from
+        return post.season == self.season and post.title is not None and post.table is not None and \
+            post.title in self.titles
+
+    def get_mode(self, reconstruction):
+        return self.mode or reconstruction
+
+
+def load_jobs(path=JOBS_PATH):
+    return load(path, _parse_jobs)
+
+
+def select_job_posts(blog_posts, jobs, job_posts):
+    # Passes the posts through, adding each post a job picks to that job's list in job_posts
+    for bp in blog_posts:
+        if not bp.is_unneeded_post:
+            for job, posts in zip(jobs, job_posts):
+                if job.picks(bp):
+                    posts.append(bp)
+        yield bp
+
+
+def get_job_fingerprint(job, posts, reconstruction):
+    # Changes when the job's definition or any of the posts it picks do
+    sha256 = hashlib.sha256(json.dumps([job._replace(mode=job.get_mode(reconstruction))]).encode())
+    for bp in posts:
+        sha256.update(json.dumps([bp.post_id, bp.title, str(bp.date), len(bp.games)]).encode())
+        sha256.update(pd.util.hash_pandas_object(bp.table, index=False).values.tobytes())
+    return sha256.hexdigest()
+
+
+def run_job(job, posts, reconstruction):
+    logger.info(f"Reconstructing {job.name} from {len(posts)} posts")
+    return RECONSTRUCTIONS[job.get_mode(reconstruction)](list(posts), job.include_first)
+
+
+def _parse_jobs(path):
+    with open(path) as inputfile:
+        jobs = yaml.load(inputfile, Loader=YAML_LOADER) or []
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        raise ValueError(f"{path} should be a list of reconstruction jobs")
+    parsed = []
+    for job in jobs:
+        unknown = set(job) - set(ReconstructionJob._fields)
+        if unknown:
+            raise ValueError(f"Reconstruction job {job.get('name')} in {path} has unknown fields {sorted(unknown)}")
+        if not isinstance(job.get("name"), str) or not JOB_NAME.fullmatch(job["name"]):
+            raise ValueError(f"Every reconstruction job in {path} needs a name of letters, digits, '.', '-' and '_'")
+        titles = job.get("titles")
+        if not isinstance(job.get("season"), str) or not isinstance(titles, list) or not titles or \
+                not all(isinstance(t, str) for t in titles):
+            raise ValueError(f"Reconstruction job {job['name']} in {path} needs a season and a list of titles")
+        if job.get("mode") not in [None, *RECONSTRUCTIONS]:
+            raise ValueError(f"Reconstruction job {job['name']} in {path} has an unknown mode {job['mode']}")
+        parsed.append(ReconstructionJob(job["name"], job["season"], tuple(titles), bool(job.get("include_first")),
+                                        job.get("mode")))
+    names = [job.name for job in parsed]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Reconstruction job names in {path} should be unique")
+    return tuple(parsed)
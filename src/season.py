@@ -1,53 +1,80 @@
 import logging
 import pandas as pd
-from fuzzywuzzy import fuzz
-import unicodedata
-import csv
 import os
-import yaml
 import numpy as np
 
+from src.config import load_dropouts, load_forced_pseudonyms, load_site_names
+from src.files import atomic_write
+from src.fixtures import FixtureMatrix
+from src.overlays import LAYERS, OverlayStack
+from src.standings import get_standings, get_standings_snapshots
+from src.team_names import default_index
+
 logger = logging.getLogger(__name__)
 
 
+def apply_team_aliases(games, team_aliases):
+    # Renames both team columns in one lookup each, leaving strings without an alias (e.g., dropouts) as they are
+    return games.assign(**{col: games[col].map(team_aliases).fillna(games[col]) for col in ["home_team", "away_team"]})
+
+
 class Season:
 
-    def __init__(self, season_name, final_table, games):
+    def __init__(self, season_name, final_table, games, team_name_index=None, overlays=None, dropouts=None,
+                 forced_pseudonyms=None):
         self.season_name = season_name
         self.final_table = final_table
         # Some weird non-breaking space character has to be replaced with a normal space
         self.teams = [t.replace(u'\xa0', u' ').replace("  ", " ") for t in self.final_table['Team'].to_list()]
         self.games = games
-        self.dropouts = self._get_dropouts()
-        self.forced_pseudonyms = self._get_forced_pseudonyms()
+        # Read from the season's own files unless they've been loaded for every season already
+        self.dropouts = self._get_dropouts() if dropouts is None else dropouts
+        self.forced_pseudonyms = self._get_forced_pseudonyms() if forced_pseudonyms is None else forced_pseudonyms
+        self.team_name_index = team_name_index or default_index
+        self.overlays = overlays
+        self.team_aliases = {}
+        self.table = None
 
     def drop_dropouts(self):
         self.games = self.games.loc[(self.games["home_team"].isin(self.teams)) &
                                     (self.games["away_team"].isin(self.teams))]
 
-    def fix_team_name_variation(self):
+    def fix_team_name_variation(self, strict=False):
         team_strs = pd.unique(self.games[['home_team', 'away_team']].values.ravel('K'))
         team_strs = [s for s in team_strs if s not in [p for k, v in self.forced_pseudonyms.items() for p in v]]
         team_pseudonyms = {t: [t] for t in self.teams}
         for k, v in self.forced_pseudonyms.items():
-            team_pseudonyms[k].append(v)
+            team_pseudonyms[k].extend(v)
         team_pseudonyms = self._find_team_pseudonyms(team_pseudonyms, team_strs)
-
-        def replace_multiple_substrings(row, targets, replacement):
-            result = row
-            for t in targets:
-                result = result.replace(t, replacement)
-            return result
-
+        self.team_aliases = self._get_team_aliases(team_pseudonyms, strict)
+        self.games = apply_team_aliases(self.games, self.team_aliases)
+
+    def _get_team_aliases(self, team_pseudonyms, strict=False):
+        # Every team name maps to itself, so a team's own name is never taken over by another team that it fuzzy
+        # matched. Otherwise an alias of more than one team goes to the first of them
+        team_aliases = {t: t for t in team_pseudonyms}
+        ambiguous = {}
         for k, v in team_pseudonyms.items():
-            self.games[['home_team', 'away_team']] = \
-                self.games[['home_team', 'away_team']].apply(lambda x: replace_multiple_substrings(x, v, k))
+            for alias in v:
+                # A team's own name isn't ambiguous however many other teams it fuzzy matched
+                if team_aliases.setdefault(alias, k) != k and alias not in team_pseudonyms:
+                    ambiguous.setdefault(alias, [team_aliases[alias]]).append(k)
+        ambiguous_str = "; ".join(f"{alias} ({', '.join(teams)})" for alias, teams in ambiguous.items())
+        unmapped = [s for s in pd.unique(self.games[['home_team', 'away_team']].values.ravel('K'))
+                    if s not in team_aliases and s not in self.dropouts]
+        if strict and (ambiguous or unmapped):
+            raise RuntimeError(f"The following team strings don't map to exactly one team: "
+                               f"{', '.join(map(str, unmapped + list(ambiguous)))}")
+        if ambiguous:
+            logger.warning(f"The following team strings match more than one team, using the first: {ambiguous_str}")
+        return team_aliases
 
     def _find_team_pseudonyms(self, team_pseudonyms, team_strs):
+        matches = self.team_name_index.match(self.season_name, list(team_pseudonyms), team_strs,
+                                             self.forced_pseudonyms)
         for k, v in team_pseudonyms.items():
             for ts in team_strs:
-                if fuzz.partial_ratio(self._prep_for_fuzz(k), self._prep_for_fuzz(ts)) >= 80 \
-                        and ts not in v:
+                if k in matches[ts] and ts not in v:
                     team_pseudonyms[k].append(ts)
 
         unassigned_strs = [ts for ts in team_strs if ts not in [tn for k, v in team_pseudonyms.items() for tn in v]]
@@ -55,113 +82,54 @@ class Season:
             raise RuntimeError(f"The following team strings have not been assigned: {unassigned_strs}")
         return team_pseudonyms
 
-    @staticmethod
-    def _prep_for_fuzz(s):
-        return ''.join(c for c in unicodedata.normalize('NFD',
-                                                        s.lower().replace(":", "").replace("-", "").replace(" ", ""))
-                       if unicodedata.category(c) != 'Mn')
+    def _prep_for_fuzz(self, s):
+        return self.team_name_index.prep_for_fuzz(s)
 
     def _get_dropouts(self):
         path = os.path.join("data/dropouts", self.season_name.replace('/', '_') + '.csv')
         if not os.path.isfile(path):
             return []
-        dropouts = []
-        with open(path, newline='') as inputfile:
-            for row in csv.reader(inputfile):
-                dropouts.append(row[0])
-        return dropouts
+        return load_dropouts(path)
 
     def _get_forced_pseudonyms(self):
         path = os.path.join("data/pseudonyms", self.season_name.replace('/', '_') + '.yml')
         if not os.path.isfile(path):
             return {}
-        with open(path) as inputfile:
-            pseudoynms = yaml.load(inputfile, Loader=yaml.SafeLoader)
-        return pseudoynms
+        return load_forced_pseudonyms(path)
 
     def remove_void_games(self):
-        void_games = pd.read_csv("data/games/void_games.csv")
-        self.games = pd.merge(self.games, void_games, how="outer", indicator=True)
-        self.games = self.games[self.games._merge == "left_only"].drop(["_merge"], axis=1)
+        if self.overlays is None:
+            self.overlays = OverlayStack.load()
+        n_games = len(self.games)
+        self.games = self.overlays.remove_void(self.games)
+        if "source_layer" in self.games:
+            layer_counts = self.games["source_layer"].value_counts()
+            logger.info(f"{self.season_name}: " + ", ".join(f"{layer_counts.get(layer, 0)} {layer}"
+                                                            for layer in LAYERS) +
+                        f" games, {n_games - len(self.games)} void games removed")
 
     def fix_duplicate_missing_games(self):
-        # Make a full home/away fixture list, i.e., all games that should have been played
-        expected_games = pd.DataFrame(columns=["home_team", "away_team"])
-        for i in range(len(self.teams)):
-            for j in range(i + 1, len(self.teams)):
-                expected_games = expected_games.append({"home_team": self.teams[i], "away_team": self.teams[j]},
-                                                       ignore_index=True)
-                expected_games = expected_games.append({"home_team": self.teams[j], "away_team": self.teams[i]},
-                                                       ignore_index=True)
-        # Compare actual game list with expected to identify missing games
-        missing_games = pd.concat([self.games.copy(), expected_games]).drop_duplicates(
-            ["home_team", "away_team"], keep=False)
-        # Find fixtures that were supposedly played twice
-        duplicate_games = self.games[self.games.duplicated(["home_team", "away_team"], False)]
-        # Swap home/away teams for all duplicate fixtures
-        duplicates_flipped = duplicate_games.rename(columns={"home_team": "away_team", "away_team": "home_team",
-                                                             "home_score": "away_score", "away_score": "home_score"})
-        duplicates_flipped = pd.DataFrame({"home_team": duplicate_games["away_team"],
-                                           "away_team": duplicate_games["home_team"],
-                                           "home_score": duplicate_games["away_score"],
-                                           "away_score": duplicate_games["home_score"],
-                                           "filepath": duplicate_games["filepath"],
-                                           "post_title": duplicate_games["post_title"],
-                                           "date": duplicate_games["date"],
-                                           "season": duplicate_games["season"],
-                                           "competition": duplicate_games["competition"]})
-        # Check if any of the duplicate games were actually written with wrong home/away order by checking if their
-        # flipped versions can be found in the missing games list
-        flipped_games = duplicates_flipped.merge(missing_games[["home_team", "away_team"]],
-                                                 on=["home_team", "away_team"]).sort_values(
-            "date").drop_duplicates(["home_team", "away_team"], keep="last")
-        # For any games in which this is true, add them to the games list with the more recent fixture flipped home/away
-        self.games = self.games.append(flipped_games)
-        # Find the flipped games in the original (incorrect) home/away order and remove them from the games list while
-        # keeping the previously added flipped versions
-        flipped_games_original = flipped_games.rename(columns={"home_team": "away_team", "away_team": "home_team",
-                                                               "home_score": "away_score", "away_score": "home_score"})
-        self.games = pd.merge(self.games,
-                              flipped_games_original[["home_team", "away_team", "home_score", "away_score"]],
-                              on=["home_team", "away_team", "home_score", "away_score"], indicator=True,
-                              how='outer').query('_merge=="left_only"').drop('_merge', axis=1)
+        self.games = self.games.reset_index(drop=True)
+        fixtures = FixtureMatrix(self.teams, self.games)
+        # Check if any fixtures that were supposedly played twice were actually written with wrong home/away order by
+        # checking if their reverse fixture is missing
+        reversed_fixtures = fixtures.get_reversed()
+        if not reversed_fixtures.empty:
+            # For any fixtures in which this is true, flip the more recent game home/away
+            duplicate_games = self.games[fixtures.get_game_mask(reversed_fixtures)].sort_values("date", kind="stable")
+            flip_index = duplicate_games.drop_duplicates(["home_team", "away_team"], keep="last").index
+            self.games.loc[flip_index, ["home_team", "away_team", "home_score", "away_score"]] = \
+                self.games.loc[flip_index, ["away_team", "home_team", "away_score", "home_score"]].to_numpy()
         # Any remaining duplicates are legitimate duplicates, for each one keep the most recent game (as sometimes)
         # a game has been written off as a walkover and then later actually played
-        self.games = self.games.sort_values("date").drop_duplicates(["home_team", "away_team"], keep="last")
-        missing_games = pd.concat([self.games.copy(), expected_games]).drop_duplicates(
-            ["home_team", "away_team"], keep=False)
-        if not missing_games.empty:
-            missing_games_str = ", ".join([r[0] + " vs. " + r[1] for r in
-                                           missing_games[["home_team", "away_team"]].values])
-            logger.warning(f"The following games are missing: {missing_games_str}")
+        self.games = self.games.sort_values("date", kind="stable").drop_duplicates(["home_team", "away_team"],
+                                                                                   keep="last")
+        self.find_missing_games()
 
     def play_season(self):
-        table = self.final_table.copy()
-        table[table.columns.difference(["Rank", "Team"])] = 0
-
-        self.games["home_win"] = self.games["away_win"] = self.games["Draw"] = 0
-        self.games.loc[:, "home_win"][(self.games["home_score"] - self.games["away_score"]) > 0] = 1
-        self.games.loc[:, "away_win"][(self.games["home_score"] - self.games["away_score"]) < 0] = 1
-        self.games.loc[:, "Draw"][(self.games["home_score"] - self.games["away_score"]) == 0] = 1
-
-        home_table = self.games.loc[:, ["home_team", "home_win", "Draw", "away_win", "home_score", "away_score"]] \
-            .rename(columns={"home_team": "Team", "home_win": "Won", "away_win": "Loss",
-                             "home_score": "GF", "away_score": "GA"}).groupby("Team").sum()
-        home_table["Points"] = 3 * home_table["Won"] + home_table["Draw"]
-        home_table["Played"] = home_table["Won"] + home_table["Draw"] + home_table["Loss"]
-        home_table["Goal difference"] = home_table["GF"] - home_table["GA"]
-        away_table = self.games.loc[:, ["away_team", "away_win", "Draw", "home_win", "away_score", "home_score"]] \
-            .rename(columns={"away_team": "Team", "away_win": "Won", "home_win": "Loss",
-                             "away_score": "GF", "home_score": "GA"}).groupby("Team").sum()
-        away_table["Points"] = 3 * away_table["Won"] + away_table["Draw"]
-        away_table["Played"] = away_table["Won"] + away_table["Draw"] + away_table["Loss"]
-        away_table["Goal difference"] = away_table["GF"] - away_table["GA"]
-        complete_table = home_table.add(away_table, fill_value=0)
-        complete_table = complete_table.reset_index().rename(columns={"Won": "W", "Draw": "D", "Loss": "L",
-                                                                      "GF": "F", "GA": "A", "Points": "Pts",
-                                                                      "Played": "P", "Goal difference": "GD"})
+        self.table = get_standings(self.teams, self.games)
         # diff_table = self.final_table.sort_values("Team").set_index("Team").applymap(int)\
-        #     .subtract(complete_table.sort_values("Team").set_index("Team").applymap(int), axis=1).reset_index()
+        #     .subtract(self.table.sort_values("Team").set_index("Team").applymap(int), axis=1).reset_index()
         # finalised_games = pd.DataFrame(columns=["Date dd/mm/yyyy", "Time HH:MM", "Division", "Home Team", "Away Team",
         #                                         "Venue", "Pitch", "Home Score", "Away Score"])
         finalised_games = self.games.rename(columns={"home_team": "Home Team", "away_team": "Away Team",
@@ -176,26 +144,22 @@ class Season:
         finalised_games["Away Score"] = pd.to_numeric(finalised_games["Away Score"], downcast="integer")
         finalised_games["Home Team"] = self.use_site_names(finalised_games["Home Team"])
         finalised_games["Away Team"] = self.use_site_names(finalised_games["Away Team"])
-        finalised_games[["Date dd/mm/yyyy", "Time HH:MM", "Division", "Home Team", "Away Team", "Venue", "Pitch",
-                        "Home Score", "Away Score"]].to_csv(
-            f"data/finalised_games/{self.season_name.replace('/','-')}.csv", index=False)
+        with atomic_write(f"data/finalised_games/{self.season_name.replace('/','-')}.csv", newline="") as csv_file:
+            finalised_games[["Date dd/mm/yyyy", "Time HH:MM", "Division", "Home Team", "Away Team", "Venue", "Pitch",
+                            "Home Score", "Away Score"]].to_csv(csv_file, index=False)
 
-    def use_site_names(self, team_col):
-        with open("data/match_site_names/match_site_names.yml") as inputfile:
-            site_names = yaml.load(inputfile, Loader=yaml.SafeLoader)
+    def get_table_snapshots(self):
+        # The league table after each match date, to compare with the tables posted during the season
+        return get_standings_snapshots(self.teams, self.games)
 
-        return team_col.replace(site_names)
+    def use_site_names(self, team_col):
+        return team_col.replace(dict(load_site_names()))
 
 
     def find_missing_games(self):
-        expected_games = pd.DataFrame(columns=["home_team", "away_team"])
-        for i in range(len(self.teams)):
-            for j in range(i + 1, len(self.teams)):
-                expected_games = expected_games.append({"home_team": self.teams[i], "away_team": self.teams[j]},
-                                                       ignore_index=True)
-                expected_games = expected_games.append({"home_team": self.teams[j], "away_team": self.teams[i]},
-                                                       ignore_index=True)
-
-        missing_games = pd.concat([self.games[["home_team", "away_team"]].copy(), expected_games]).drop_duplicates(
-            keep=False)
-        print("Done")
+        missing_games = FixtureMatrix(self.teams, self.games).get_missing()
+        if not missing_games.empty:
+            missing_games_str = ", ".join([r[0] + " vs. " + r[1] for r in
+                                           missing_games[["home_team", "away_team"]].values])
+            logger.warning(f"The following games are missing: {missing_games_str}")
+        return missing_games
@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+
+import pandas as pd
+import requests
+
+from src.files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+SHEETS_DIR = "data/cache/sheets"
+BASE_URL = "https://docs.google.com/spreadsheets"
+
+
+class SheetFetcher:
+    # Google Sheets tables embedded in posts, saved as {sheet ID}_{gid}.csv so that each sheet is only downloaded
+    # once for every operation and worker. The sheet ID an embed URL redirects to is kept in redirects.json. Offline,
+    # only saved sheets can be read
+
+    def __init__(self, cache_dir=SHEETS_DIR, offline=False, session=None, timeout=30, base_url=BASE_URL):
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.base_url = base_url
+        self.index_path = os.path.join(cache_dir, "redirects.json")
+
+    def get_settings(self):
+        return {"cache_dir": self.cache_dir, "offline": self.offline, "timeout": self.timeout,
+                "base_url": self.base_url}
+
+    def get_table(self, url, gid=0):
+        sheet_id = self.get_sheet_id(url)
+        cache_path = os.path.join(self.cache_dir, f"{sheet_id}_{gid}.csv")
+        if not os.path.isfile(cache_path):
+            if self.offline:
+                raise RuntimeError(f"Sheet {sheet_id} (gid {gid}) of {url} hasn't been downloaded yet")
+            r = self.session.get(f"{self.base_url}/d/{sheet_id}/gviz/tq?tqx=out:csv&gid={gid}", timeout=self.timeout)
+            r.raise_for_status()
+            self._write(cache_path, r.content)
+            logger.debug(f"Saved sheet {sheet_id} (gid {gid}) to {cache_path}")
+        return pd.read_csv(cache_path)
+
+    def get_sheet_id(self, url):
+        redirects = self._load_index()
+        if url in redirects:
+            return redirects[url]
+        if self.offline:
+            raise RuntimeError(f"{url} hasn't been followed to its sheet yet")
+        r = self.session.get(url, timeout=self.timeout)
+        r.raise_for_status()
+        redirect_url = r.url
+        sheet_id = redirect_url.split("/")[redirect_url.split("/").index("d") + 1]
+        # Other workers may have added redirects since the index was read
+        redirects = self._load_index()
+        redirects[url] = sheet_id
+        self._write(self.index_path, json.dumps(redirects, indent=2, sort_keys=True).encode())
+        return sheet_id
+
+    def _load_index(self):
+        if not os.path.isfile(self.index_path):
+            return {}
+        with open(self.index_path) as index_file:
+            return json.load(index_file)
+
+    @staticmethod
+    def _write(path, content):
+        with atomic_write(path, "wb") as output_file:
+            output_file.write(content)
+
+
+_fetcher = SheetFetcher()
+
+
+def get_fetcher():
+    return _fetcher
+
+
+def configure(**settings):
+    # Also used as the initializer of worker processes, so they fetch sheets the same way as the main process
+    global _fetcher
+    _fetcher = SheetFetcher(**settings)
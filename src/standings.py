@@ -0,0 +1,58 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+STANDINGS_COLUMNS = ["Team", "P", "W", "D", "L", "F", "A", "GD", "Pts"]
+# Order of the counted columns in the stats arrays, GD and Pts are derived from them
+COUNTED_COLUMNS = ["P", "W", "D", "L", "F", "A"]
+
+
+def get_standings(teams, games):
+    # League table of the given teams, in the given order, from their games. Games involving any other team are
+    # ignored
+    stats = np.zeros((1, len(teams), len(COUNTED_COLUMNS)), dtype=np.int64)
+    _add_games(stats, np.zeros(len(games), dtype=np.int64), teams, games)
+    return _to_table(teams, stats[0])
+
+
+def get_standings_snapshots(teams, games):
+    # The cumulative league table after every match date, as one frame with a "date" column. Each date's games are
+    # counted into their own slice and a cumulative sum over the dates gives every table at once
+    dates = pd.to_datetime(games["date"])
+    dated = dates.notna().to_numpy()
+    if not dated.all():
+        # A game without a date can't be placed in any snapshot
+        logger.warning(f"{(~dated).sum()} games without a date are left out of the table snapshots")
+        games, dates = games[dated], dates[dated]
+    date_codes, unique_dates = pd.factorize(dates, sort=True)
+    stats = np.zeros((len(unique_dates), len(teams), len(COUNTED_COLUMNS)), dtype=np.int64)
+    _add_games(stats, date_codes, teams, games)
+    stats = stats.cumsum(axis=0)
+    snapshots = [_to_table(teams, stats[i]).assign(date=date) for i, date in enumerate(unique_dates)]
+    if not snapshots:
+        return pd.DataFrame(columns=["date"] + STANDINGS_COLUMNS)
+    return pd.concat(snapshots, ignore_index=True)[["date"] + STANDINGS_COLUMNS]
+
+
+def _add_games(stats, slice_codes, teams, games):
+    home_codes = pd.Categorical(games["home_team"], categories=teams).codes
+    away_codes = pd.Categorical(games["away_team"], categories=teams).codes
+    home_score = pd.to_numeric(games["home_score"]).to_numpy(dtype=np.int64)
+    away_score = pd.to_numeric(games["away_score"]).to_numpy(dtype=np.int64)
+    known = (home_codes >= 0) & (away_codes >= 0)
+    for codes, goals_for, goals_against in [(home_codes, home_score, away_score),
+                                            (away_codes, away_score, home_score)]:
+        counts = np.stack([np.ones_like(goals_for), goals_for > goals_against, goals_for == goals_against,
+                           goals_for < goals_against, goals_for, goals_against], axis=1).astype(np.int64)
+        np.add.at(stats, (slice_codes[known], codes[known]), counts[known])
+
+
+def _to_table(teams, stats):
+    table = pd.DataFrame(stats, columns=COUNTED_COLUMNS)
+    table.insert(0, "Team", list(teams))
+    table["GD"] = table["F"] - table["A"]
+    table["Pts"] = 3 * table["W"] + table["D"]
+    return table[STANDINGS_COLUMNS]
@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import unicodedata
+from collections import Counter
+
+from fuzzywuzzy import fuzz
+
+from src.files import write_json
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to the matching would change the teams a string resolves to, so that saved aliases are
+# resolved again
+MATCHER_VERSION = 2
+MATCH_THRESHOLD = 80
+
+
+class TeamNameIndex:
+    # Resolves the team strings found in games to the team names of a season's final table. Strings are normalised
+    # once however many seasons they turn up in, teams without enough characters in common with a string to reach the
+    # threshold are ruled out before fuzzy matching, and every resolved string is remembered per season so later runs
+    # skip the matching
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.seasons = {}
+        self._prepped = {}
+        self._char_counts = {}
+        if cache_path and os.path.isfile(cache_path):
+            with open(cache_path) as cache_file:
+                cache = json.load(cache_file)
+            # Aliases resolved by another version of the matching are resolved again
+            if cache.get("matcher") == get_matcher_version():
+                self.seasons = cache["seasons"]
+
+    def save(self):
+        if not self.cache_path:
+            return
+        write_json(self.cache_path, {"matcher": get_matcher_version(), "seasons": self.seasons})
+
+    def match(self, season_name, teams, team_strs, forced_pseudonyms=None):
+        # Returns {team string: [teams it matches]}. A season's aliases are thrown away if its teams or its pseudonyms
+        # file have changed since they were resolved
+        forced_pseudonyms = {k: list(v) for k, v in (forced_pseudonyms or {}).items()}
+        season = self.seasons.get(season_name)
+        if season is None or season["teams"] != list(teams) or season["pseudonyms"] != forced_pseudonyms:
+            season = self.seasons[season_name] = {"teams": list(teams), "pseudonyms": forced_pseudonyms, "aliases": {}}
+        aliases = season["aliases"]
+        unseen = [ts for ts in team_strs if ts not in aliases]
+        for ts in unseen:
+            aliases[ts] = [t for t in teams if self._can_match(t, ts) and
+                           fuzz.partial_ratio(self.prep_for_fuzz(t), self.prep_for_fuzz(ts)) >= MATCH_THRESHOLD]
+        if unseen:
+            logger.debug(f"Fuzzy matched {len(unseen)} new team strings for {season_name}")
+        return {ts: aliases[ts] for ts in team_strs}
+
+    def _can_match(self, team, team_str):
+        # partial_ratio compares the shorter string with a part of the longer one no longer than itself. If they have
+        # c characters in common, that's at most 2c / (len(shorter) + c), so a team below the threshold by that bound
+        # can be ruled out without computing the ratio
+        prepped_team, prepped_str = self.prep_for_fuzz(team), self.prep_for_fuzz(team_str)
+        if prepped_team == prepped_str:
+            return True
+        common = sum((self._get_char_counts(prepped_team) & self._get_char_counts(prepped_str)).values())
+        return common > 0 and \
+            round(200 * common / (min(len(prepped_team), len(prepped_str)) + common)) >= MATCH_THRESHOLD
+
+    def prep_for_fuzz(self, s):
+        if s not in self._prepped:
+            self._prepped[s] = ''.join(c for c in unicodedata.normalize('NFD', s.lower().replace(":", "")
+                                                                        .replace("-", "").replace(" ", ""))
+                                       if unicodedata.category(c) != 'Mn')
+        return self._prepped[s]
+
+    def _get_char_counts(self, prepped):
+        if prepped not in self._char_counts:
+            self._char_counts[prepped] = Counter(prepped)
+        return self._char_counts[prepped]
+
+
+def get_matcher_version():
+    return f"{MATCHER_VERSION}:{MATCH_THRESHOLD}"
+
+
+# Shared by every Season that isn't given its own index, so normalised strings are reused across seasons
+default_index = TeamNameIndex()
@@ -0,0 +1,73 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def get_page_delay(path):
+    # For paths ending in a page number: lower pages are answered more slowly, so they come last when requested together
+    return 0.05 / (1 + int(path.rsplit("/", 1)[-1]))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server.stand_in
+        server.requests.append(self.path)
+        server.request_times.append(time.monotonic())
+        if self.path in server.failing:
+            server.failing.remove(self.path)
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.path in server.redirects:
+            self.send_response(302)
+            self.send_header("Location", server.redirects[self.path])
+            self.end_headers()
+            return
+        if self.path not in server.pages:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if server.delay:
+            time.sleep(server.delay(self.path))
+        content = server.pages[self.path]
+        content = content.encode() if isinstance(content, str) else content
+        etag = '"' + hashlib.md5(content).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    # A local stand-in for the blog and Google Sheets. Serves pages ({path: content}) with ETags, redirects the paths
+    # in redirects ({path: location}) and records every request's path and time. The first request for a path in
+    # failing gets a 500, and delay, when given, is called with each path for the seconds to wait before answering it
+
+    def __init__(self, pages=None, redirects=None, delay=None):
+        self.pages = pages or {}
+        self.redirects = redirects or {}
+        self.delay = delay
+        self.failing = set()
+        self.requests = []
+        self.request_times = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self._server.stand_in = self
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
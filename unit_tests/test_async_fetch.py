@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+import requests
+
+from src.async_fetch import AsyncFetcher
+from unit_tests.stand_in_server import StandInServer, get_page_delay
+
+
+def get_body(url, content):
+    return url.rsplit("/", 1)[-1], content.decode()
+
+
+class TestAsyncFetcher(TestCase):
+
+    def setUp(self):
+        self.server = StandInServer({f"/page/{i}": f"<html>{i}</html>" for i in range(1, 6)},
+                                    delay=get_page_delay).start()
+        self.addCleanup(self.server.stop)
+        self.base_url = self.server.base_url
+        self.urls = [f"{self.base_url}/page/{i}" for i in range(1, 6)]
+
+    def _fetcher(self, rate_per_host=None):
+        return AsyncFetcher(concurrency=5, rate_per_host=rate_per_host, retries=2, backoff=0.01, timeout=5,
+                            session=requests.Session())
+
+    def test_results_keep_url_order(self):
+        expected = [(str(i), f"<html>{i}</html>") for i in range(1, 6)]
+        self.assertEqual(expected, self._fetcher().fetch_all(self.urls, get_body))
+        self.assertEqual(expected, self._fetcher().fetch_all(self.urls, get_body, workers=2))
+
+    def test_failed_request_is_retried(self):
+        self.server.failing.add("/page/3")
+        self.assertEqual(("3", "<html>3</html>"), self._fetcher().fetch_all(self.urls, get_body)[2])
+        self.assertEqual(2, self.server.requests.count("/page/3"))
+
+    def test_missing_page_is_not_retried(self):
+        with self.assertRaises(requests.HTTPError):
+            self._fetcher().fetch_all([self.base_url + "/page/6"], get_body)
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_requests_to_a_host_are_spaced(self):
+        self._fetcher(rate_per_host=20).fetch_all(self.urls, get_body)
+        request_times = sorted(self.server.request_times)
+        self.assertTrue(all(later - earlier >= 0.04 for earlier, later in zip(request_times, request_times[1:])))
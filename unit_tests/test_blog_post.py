@@ -1,7 +1,10 @@
-from unittest import TestCase
+import os
+import re
+from unittest import TestCase, mock
 from bs4 import BeautifulSoup
+import html2text
 
-from src.blog_post import BlogPost
+from src.blog_post import NORMALIZED_TEXT_STEPS, TITLE_TEXT_STEPS, BlogPost
 from src.game import Game
 
 
@@ -177,4 +180,95 @@ Red Card (Tjerk)"""
         blog_post = BlogPost("", "", "", "", "")
         actual = blog_post.find_games_in_text(text)
         expected = [[" Capitals  7  – 2 Brothers", 'Capitals', '7', '2', "Brothers", ""]]
-        self.assertEqual(expected, actual)
\ No newline at end of file
+        self.assertEqual(expected, actual)
+
+    def test_get_scorers_str_with_continuation_line(self):
+        text = """Capitals 7 – 2 Brothers
+Goals: Capitals: Josh (3), Pete, Lucas, Renato,
+Martin; Brothers: Ngọc Quang (2)
+Minsk 1-1 Hanoi Capitals"""
+        games = [["Capitals 7 – 2 Brothers", "Capitals", "7", "2", "Brothers", ""],
+                 ["Minsk 1-1 Hanoi Capitals", "Minsk", "1", "1", "Hanoi Capitals", ""]]
+        result = BlogPost._get_scorers_str(games, text)
+        expected = [["Capitals 7 – 2 Brothers", "Capitals", "7", "2", "Brothers",
+                     "Goals: Capitals: Josh (3), Pete, Lucas, Renato, Martin; Brothers: Ngọc Quang (2)"],
+                    ["Minsk 1-1 Hanoi Capitals", "Minsk", "1", "1", "Hanoi Capitals", None]]
+        self.assertEqual(expected, result)
+
+    def test_get_scorers_str_keeps_scorers_in_brackets(self):
+        text = """Drink 4-1 Roots (Ben 40' Son 45')
+Goals: Drink: Thang, Thomas;
+Roots: Baptiste
+Minsk 1-1 Hanoi Capitals (Andrei; Josh)"""
+        games = BlogPost.find_games_in_text(text)
+        result = BlogPost._get_scorers_str(games, text)
+        self.assertEqual(["Ben 40' Son 45' Goals: Drink: Thang, Thomas; Roots: Baptiste", "Andrei; Josh"],
+                         [g[-1] for g in result])
+        self.assertEqual([6, 6], [len(g) for g in result])
+
+    def test_get_scorers_str_with_duplicate_game_strings(self):
+        text = """Drink 4-1 Roots
+Goals: Drink: Ben x 4; Roots: Baptiste
+Drink 4-1 Roots
+Goals: Drink: Son x 4; Roots: Nico"""
+        games = [["Drink 4-1 Roots", "Drink", "4", "1", "Roots", ""],
+                 ["Drink 4-1 Roots", "Drink", "4", "1", "Roots", ""]]
+        result = BlogPost._get_scorers_str(games, text)
+        self.assertEqual(["Goals: Drink: Ben x 4; Roots: Baptiste", "Goals: Drink: Son x 4; Roots: Nico"],
+                         [g[-1] for g in result])
+
+    def test_get_scorers_str_when_goals_line_is_last_line(self):
+        text = """HSS 0 – Drink 7
+Goals: Drink: Huy (3), Olivier (2), Thang Jr,"""
+        games = [["HSS 0 – Drink 7", 'HSS', '0', '7', "Drink", ""]]
+        result = BlogPost._get_scorers_str(games, text)
+        self.assertEqual("Goals: Drink: Huy (3), Olivier (2), Thang Jr,", result[0][-1])
+
+    def test_get_scorers_str_when_game_is_last_line(self):
+        text = """Goals: Drink: Huy (3)
+HSS 0 – Drink 7"""
+        games = [["HSS 0 – Drink 7", 'HSS', '0', '7', "Drink", ""]]
+        result = BlogPost._get_scorers_str(games, text)
+        self.assertIsNone(result[0][-1])
+
+    def test_post_is_converted_to_text_once(self):
+        post_html = BeautifulSoup("""
+<div class="post-outer">
+<h3 class="post-title entry-title" itemprop="name">Week 2 - Cup Draw</h3>
+<div class="post-body entry-content">
+<b>Drink Team</b> 2 - 1 Roots<br/>
+Goals: Drink Team: Ben x 2; Roots: Baptiste<br/>
+Game 1. Minsk vs. Capitals<br/>
+</div>
+</div>""", "html.parser").div
+        with mock.patch("src.blog_post.html2text.html2text", wraps=html2text.html2text) as convert:
+            blog_post = BlogPost("", "", post_html, "", "").prepare(False)
+            cup_participants = blog_post.get_cup_participants()
+        self.assertEqual(["Minsk", "Capitals"], [t.strip() for t in cup_participants["teams"]])
+        convert.assert_called_once()
+        self.assertEqual("Week 2 - Cup Draw", blog_post.title)
+        self.assertEqual([("Drink Team", 2, 1, "Roots")],
+                         [(g.home_team, g.home_score, g.away_score, g.away_team) for g in blog_post.games])
+
+    def test_text_steps_match_inline_clean_up(self):
+        html_text = html2text.html2text("""<h3><a href="http://hifl.blogspot.com/week-2.html">Week 2
+Results</a></h3>
+<p><b>Drink Tea m</b> 2 - 1 Roots_FC</p><p>  </p><p># Goals: <i>Ben</i> (2)</p>""")
+
+        def legacy_title_text(html_text):
+            hyperlinks = BlogPost.find_hyperlinks_in_text(html_text)
+            hl_text_clean = ["\n" * h[0].startswith("\n") + h[0].replace("\n", " ") + "\n" * h[0].endswith("\n")
+                             for h in hyperlinks]
+            for replace, original in zip(hl_text_clean, hyperlinks):
+                html_text = html_text.replace("".join(["[", original[0], "](", original[1], ")"]), replace)
+            html_text = html_text.replace("**", "").replace("#", "")
+            return os.linesep.join([s for s in html_text.splitlines() if s and not s.isspace()])
+
+        def legacy_normalized_text(html_text):
+            html_text = html_text.replace("**", "").replace("_", "").replace("Tea m", "Team")
+            return os.linesep.join([s for s in html_text.splitlines() if s and not s.isspace()])
+
+        self.assertTrue(re.search(r"\[.*\]\(http", html_text, re.DOTALL))
+        self.assertEqual(legacy_title_text(html_text), BlogPost._apply_text_steps(html_text, TITLE_TEXT_STEPS))
+        self.assertEqual(legacy_normalized_text(html_text),
+                         BlogPost._apply_text_steps(html_text, NORMALIZED_TEXT_STEPS))
@@ -0,0 +1,89 @@
+import copy
+from types import SimpleNamespace
+from unittest import TestCase
+
+import pandas as pd
+
+from src.compute_missing_games import compute_missing_games, reconstruct_missing_games
+from unit_tests.missing_games_reference import legacy_compute_missing_games, make_round_robin_season
+
+
+def make_post(title, rows):
+    table = pd.DataFrame(rows, columns=["Team", "P", "W", "D", "L", "F", "A", "GD", "Pts"])
+    return SimpleNamespace(table=table, title=title, date=title, season="2014/15", filepath="", post_id=title,
+                           games=[])
+
+
+class TestComputeMissingGames(TestCase):
+
+    def setUp(self):
+        self.week_1 = make_post("Week 1", [["Drink", 0, 0, 0, 0, 0, 0, 0, 0],
+                                           ["Roots", 0, 0, 0, 0, 0, 0, 0, 0],
+                                           ["Minsk", 0, 0, 0, 0, 0, 0, 0, 0],
+                                           ["Capitals", 0, 0, 0, 0, 0, 0, 0, 0]])
+
+    def test_certain_games_have_full_confidence(self):
+        week_2 = make_post("Week 2", [["Drink", 1, 1, 0, 0, 2, 1, 1, 3],
+                                      ["Roots", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Minsk", 1, 0, 1, 0, 0, 0, 0, 1],
+                                      ["Capitals", 1, 0, 1, 0, 0, 0, 0, 1]])
+        games = reconstruct_missing_games([self.week_1, week_2])
+        self.assertCountEqual([("Capitals", "Minsk", 0, 0, 1.0), ("Drink", "Roots", 2, 1, 1.0)],
+                              [tuple(g) for g in games[["home_team", "away_team", "home_score", "away_score",
+                                                        "confidence"]].values])
+        self.assertFalse(games["ambiguous"].any())
+
+    def test_ambiguous_games_share_confidence(self):
+        week_2 = make_post("Week 2", [["Drink", 1, 1, 0, 0, 2, 1, 1, 3],
+                                      ["Roots", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Minsk", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Capitals", 0, 0, 0, 0, 0, 0, 0, 0]])
+        games = reconstruct_missing_games([self.week_1, week_2])
+        self.assertEqual(1, len(games))
+        self.assertEqual(0.5, games["confidence"][0])
+        self.assertTrue(games["ambiguous"][0])
+
+    def test_every_unmatched_row_is_carried_to_next_round(self):
+        week_2 = make_post("Week 2", [["Drink", 1, 1, 0, 0, 2, 1, 1, 3],
+                                      ["Roots", 0, 0, 0, 0, 0, 0, 0, 0],
+                                      ["Minsk", 1, 0, 1, 0, 3, 3, 0, 1],
+                                      ["Capitals", 0, 0, 0, 0, 0, 0, 0, 0]])
+        week_3 = make_post("Week 3", [["Drink", 1, 1, 0, 0, 2, 1, 1, 3],
+                                      ["Roots", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Minsk", 1, 0, 1, 0, 3, 3, 0, 1],
+                                      ["Capitals", 1, 0, 1, 0, 3, 3, 0, 1]])
+        games = reconstruct_missing_games([self.week_1, week_2, week_3])
+        self.assertCountEqual([("Roots", "Drink"), ("Capitals", "Minsk")],
+                              [tuple(g) for g in games[["home_team", "away_team"]].values])
+
+    def test_greedy_pairing_keeps_first_match(self):
+        week_2 = make_post("Week 2", [["Drink", 1, 1, 0, 0, 2, 1, 1, 3],
+                                      ["Roots", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Minsk", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Capitals", 0, 0, 0, 0, 0, 0, 0, 0]])
+        games = compute_missing_games([self.week_1, week_2])
+        # Diff tables are ordered by team name, so Minsk is the first complementary row Drink finds
+        self.assertEqual([("Drink", "Minsk")], [tuple(g) for g in games[["home_team", "away_team"]].values])
+
+    def assert_same_as_legacy(self, posts):
+        legacy = legacy_compute_missing_games(copy.deepcopy(posts))
+        games = compute_missing_games(copy.deepcopy(posts)).drop(columns=["post_id", "game_index"])
+        self.assertEqual(legacy.astype(str).values.tolist(), games.astype(str).values.tolist())
+        return games
+
+    def test_greedy_matches_legacy_on_synthetic_season(self):
+        games = self.assert_same_as_legacy(make_round_robin_season())
+        # Every team plays once a round, so each of the 380 games can be rebuilt from the tables
+        self.assertEqual(380, len(games))
+
+    def test_greedy_matches_legacy_with_ambiguous_and_unmatched_rows(self):
+        # Drink's 2-1 win could be against Minsk or Roots, and only the last unmatched row of a round is carried over
+        week_2 = make_post("Week 2", [["Drink", 1, 1, 0, 0, 2, 1, 1, 3],
+                                      ["Roots", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Minsk", 1, 0, 0, 1, 1, 2, -1, 0],
+                                      ["Capitals", 1, 0, 1, 0, 3, 3, 0, 1]])
+        week_3 = make_post("Week 3", [["Drink", 2, 2, 0, 0, 4, 2, 2, 6],
+                                      ["Roots", 2, 0, 0, 2, 2, 4, -2, 0],
+                                      ["Minsk", 2, 0, 1, 1, 4, 5, -1, 1],
+                                      ["Capitals", 1, 0, 1, 0, 3, 3, 0, 1]])
+        self.assert_same_as_legacy([self.week_1, week_2, week_3])
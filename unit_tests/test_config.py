@@ -0,0 +1,62 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from src import config
+
+
+class TestConfig(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, filename, content, mtime=None):
+        path = os.path.join(self.config_dir, filename)
+        with open(path, "w") as f:
+            f.write(content)
+        if mtime:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_load_is_cached_until_modified(self):
+        path = self.write("match_site_names.yml", "Drink Team: Hanoi Drink Team\n", 1000)
+        site_names = config.load_site_names(path)
+        self.assertIs(site_names, config.load_site_names(path))
+        self.write("match_site_names.yml", "Drink Team: Drink\n", 2000)
+        self.assertEqual({"Drink Team": "Drink"}, dict(config.load_site_names(path)))
+
+    def test_each_parse_of_a_file_is_cached_apart(self):
+        path = self.write("match_site_names.yml", "Drink Team: Hanoi Drink Team\n")
+        self.assertEqual({"Drink Team": "Hanoi Drink Team"}, dict(config.load_site_names(path)))
+        self.assertEqual(29, config.load(path, os.path.getsize))
+        self.assertEqual({"Drink Team": "Hanoi Drink Team"}, dict(config.load_site_names(path)))
+
+    def test_loaded_configs_are_read_only(self):
+        path = self.write("2014_15.yml", "Drink Team:\n  - Drinks\n")
+        pseudonyms = config.load_forced_pseudonyms(path)
+        with self.assertRaises(TypeError):
+            pseudonyms["Minsk"] = ("Minks",)
+        self.assertEqual(("Drinks",), pseudonyms["Drink Team"])
+
+    def test_invalid_config(self):
+        path = self.write("2014_15.yml", "Drink Team: Drinks\n")
+        with self.assertRaises(ValueError):
+            config.load_forced_pseudonyms(path)
+        path = self.write("2014_15.csv", "Dropouts FC\n\n")
+        with self.assertRaises(ValueError):
+            config.load_dropouts(path)
+
+    def test_load_season_configs(self):
+        self.write("2014_15.csv", "Dropouts FC\nLeavers\n")
+        self.write("2015_16.yml", "Drink Team:\n  - Drinks\n")
+        self.assertDictEqual({"2014/15": ("Dropouts FC", "Leavers")},
+                             config.load_season_configs(self.config_dir, ".csv", config.load_dropouts))
+        self.assertDictEqual({"2015/16": {"Drink Team": ("Drinks",)}},
+                             {k: dict(v) for k, v in config.load_season_configs(self.config_dir, ".yml",
+                                                                                config.load_forced_pseudonyms).items()})
+        self.assertDictEqual({}, config.load_season_configs(os.path.join(self.config_dir, "missing"), ".csv",
+                                                            config.load_dropouts))
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+import requests
+
+from src.downloader import PageDownloader
+from unit_tests.stand_in_server import StandInServer
+
+
+class TestPageDownloader(TestCase):
+
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.addCleanup(self.server.stop)
+        self.base_url = self.server.base_url
+        self.server.pages = {f"/page{i}": self._make_page(i, 3) for i in range(3)}
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.page_dir = os.path.join(self.tmp_dir.name, "pages")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _make_page(self, index, page_count, text="Results"):
+        older_link = f'<a class="blog-pager-older-link" href="{self.base_url}/page{index + 1}">Older Posts</a>' \
+            if index + 1 < page_count else ""
+        return f"<html><body><div class=\"date-outer\">{text} {index}</div>{older_link}</body></html>"
+
+    def _downloader(self):
+        return PageDownloader(self.base_url + "/page0", self.page_dir, requests.Session())
+
+    def test_crawl_saves_each_page_with_a_single_request(self):
+        changed = self._downloader().crawl()
+        self.assertEqual(["/page0", "/page1", "/page2"], self.server.requests)
+        self.assertEqual([os.path.join(self.page_dir, f"page{i}.html") for i in range(3)], changed)
+        with open(os.path.join(self.page_dir, "page2.html")) as page_file:
+            self.assertEqual(self.server.pages["/page2"], page_file.read())
+
+    def test_interrupted_crawl_resumes_from_last_saved_page(self):
+        self.server.failing.add("/page2")
+        with self.assertRaises(requests.HTTPError):
+            self._downloader().crawl()
+        with open(os.path.join(self.page_dir, "manifest.json")) as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertFalse(manifest["complete"])
+        self.assertEqual(2, len(manifest["pages"]))
+        self.server.requests.clear()
+        changed = self._downloader().crawl()
+        self.assertEqual(["/page2"], self.server.requests)
+        self.assertEqual([os.path.join(self.page_dir, "page2.html")], changed)
+
+    def test_interrupted_crawl_resumes_on_refresh(self):
+        self.server.failing.add("/page2")
+        with self.assertRaises(requests.HTTPError):
+            self._downloader().crawl(refresh=True)
+        self.server.requests.clear()
+        changed = self._downloader().crawl(refresh=True)
+        self.assertEqual(["/page2"], self.server.requests)
+        self.assertEqual([os.path.join(self.page_dir, "page2.html")], changed)
+        # Once complete, a refresh revalidates every page again
+        self.server.requests.clear()
+        self.assertEqual([], self._downloader().crawl(refresh=True))
+        self.assertCountEqual(["/page0", "/page1", "/page2"], self.server.requests)
+
+    def test_refresh_only_reports_changed_pages(self):
+        self._downloader().crawl()
+        self.server.pages["/page1"] = self._make_page(1, 3, "New results")
+        self.server.requests.clear()
+        changed = self._downloader().crawl(refresh=True)
+        self.assertCountEqual(["/page0", "/page1", "/page2"], self.server.requests)
+        self.assertEqual([os.path.join(self.page_dir, "page1.html")], changed)
+
+    def test_refresh_follows_new_older_links(self):
+        self._downloader().crawl()
+        self.server.pages["/page2"] = self._make_page(2, 4)
+        self.server.pages["/page3"] = self._make_page(3, 4)
+        changed = self._downloader().crawl(refresh=True)
+        self.assertEqual([os.path.join(self.page_dir, f"page{i}.html") for i in [2, 3]], changed)
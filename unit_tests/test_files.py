@@ -0,0 +1,32 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from src.files import atomic_write, write_json
+
+
+class TestFiles(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "data", "manifest.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_write_json(self):
+        write_json(self.path, {"teams": ["FC Thống Nhất"], "complete": True})
+        with open(self.path, encoding="utf-8") as json_file:
+            self.assertEqual({"teams": ["FC Thống Nhất"], "complete": True}, json.load(json_file))
+        self.assertEqual(["manifest.json"], os.listdir(os.path.dirname(self.path)))
+
+    def test_interrupted_write_keeps_old_content(self):
+        write_json(self.path, {"complete": True})
+        with self.assertRaises(RuntimeError):
+            with atomic_write(self.path) as output_file:
+                output_file.write("{")
+                raise RuntimeError("interrupted")
+        with open(self.path) as json_file:
+            self.assertEqual({"complete": True}, json.load(json_file))
+        self.assertEqual(["manifest.json"], os.listdir(os.path.dirname(self.path)))
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from src.fixtures import FixtureMatrix
+
+
+class TestFixtureMatrix(TestCase):
+
+    def setUp(self):
+        self.teams = ["Drink", "Roots", "Minsk"]
+        games = pd.DataFrame([["Drink", "Roots"], ["Roots", "Drink"], ["Drink", "Minsk"], ["Drink", "Minsk"],
+                              ["Roots", "Minsk"], ["Minsk", "Roots"], ["Minsk", "Dropouts"]],
+                             columns=["home_team", "away_team"])
+        self.fixtures = FixtureMatrix(self.teams, games)
+
+    def test_get_missing(self):
+        self.assertEqual([("Minsk", "Drink")], [tuple(f) for f in self.fixtures.get_missing().values])
+
+    def test_get_duplicates(self):
+        self.assertEqual([("Drink", "Minsk")], [tuple(f) for f in self.fixtures.get_duplicates().values])
+
+    def test_get_reversed(self):
+        self.assertEqual([("Drink", "Minsk")], [tuple(f) for f in self.fixtures.get_reversed().values])
+
+    def test_get_game_mask(self):
+        mask = self.fixtures.get_game_mask(pd.DataFrame({"home_team": ["Drink"], "away_team": ["Minsk"]}))
+        self.assertEqual([False, False, True, True, False, False, False], mask.tolist())
+
+    def test_no_games(self):
+        fixtures = FixtureMatrix(self.teams, pd.DataFrame(columns=["home_team", "away_team"]))
+        self.assertEqual(6, len(fixtures.get_missing()))
+        self.assertTrue(fixtures.get_duplicates().empty)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+
+from src.game_store import GameStore
+
+
+class TestGameStore(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = GameStore(os.path.join(self.tmp_dir.name, "store"))
+        self.games = pd.DataFrame([["Drink", "Roots", 2, 1, "2015-01-01", "2014/15", "league", "1", 0],
+                                   ["Roots", "Drink", 0, 0, "2016-01-08", "2015/16", "league", "2", 0],
+                                   ["Minsk", "Drink", 3, 1, "2016-02-08", "2015/16", "cup", "3", 0]],
+                                  columns=["home_team", "away_team", "home_score", "away_score", "date", "season",
+                                           "competition", "post_id", "game_index"])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_types(self):
+        self.store.write(self.games)
+        games = self.store.read()
+        self.assertEqual("category", games["home_team"].dtype.name)
+        self.assertEqual("category", games["season"].dtype.name)
+        self.assertEqual("Int8", games["home_score"].dtype.name)
+        self.assertEqual("datetime64[ns]", games["date"].dtype.name)
+        self.assertEqual(3, len(games))
+
+    def test_read_season(self):
+        self.store.write(self.games)
+        self.assertEqual(["season_key=2014_15", "season_key=2015_16"], sorted(os.listdir(self.store.store_dir)))
+        games = self.store.read(["2015/16"], ["league"], ["home_team", "away_team"])
+        self.assertEqual([("Roots", "Drink")], [tuple(g) for g in games.values])
+
+    def test_write_replaces_store(self):
+        self.store.write(self.games)
+        self.store.write(self.games.iloc[:1])
+        self.assertEqual(["2014/15"], self.store.read()["season"].astype(str).to_list())
+
+    def test_write_chunks(self):
+        reconstructed = self.games.iloc[:1].assign(home_team="Minsk", confidence=0.5)
+        self.store.write(iter([self.games.iloc[1:], pd.DataFrame(), self.games.iloc[:1], reconstructed]))
+        games = self.store.read()
+        self.assertEqual(["Drink", "Minsk", "Roots", "Minsk"], games["home_team"].astype(str).to_list())
+        self.assertEqual(["Drink", "Minsk", "Roots"], games["home_team"].cat.categories.to_list())
+        # Season by season, and in the order they were written within a season
+        self.assertEqual([False, True, False, False], games["confidence"].notna().to_list())
+
+    def test_export_csv(self):
+        self.store.write([self.games.iloc[2:], self.games.iloc[:2]])
+        path = os.path.join(self.tmp_dir.name, "games.csv")
+        self.store.export_csv(path)
+        games = pd.read_csv(path, dtype={"post_id": str})
+        self.assertEqual(["1", "3", "2"], games["post_id"].to_list())
+        self.store.export_csv(path, ["2015/16"])
+        self.assertEqual(2, len(pd.read_csv(path)))
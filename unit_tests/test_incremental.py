@@ -0,0 +1,87 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from src import incremental
+from src.incremental import get_changed_pages, get_page_hashes, merge_games
+from src.post_cache import get_parser_version
+
+
+def make_games(rows):
+    return pd.DataFrame(rows, columns=["home_team", "away_team", "home_score", "away_score", "filepath", "post_id",
+                                       "game_index"])
+
+
+class TestIncremental(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, filename, content):
+        path = os.path.join(self.tmp_dir.name, filename)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_get_page_hashes(self):
+        paths = [self.write("page0.html", "Drink 4-1 Roots"), self.write("page1.html", "Drink 4-1 Roots"),
+                 self.write("page2.html", "Drink 4-2 Roots")]
+        page_hashes = get_page_hashes(paths)
+        self.assertEqual(paths, list(page_hashes))
+        self.assertEqual(page_hashes[paths[0]], page_hashes[paths[1]])
+        self.assertNotEqual(page_hashes[paths[0]], page_hashes[paths[2]])
+
+    def test_get_changed_pages(self):
+        manifest = {"parser_version": get_parser_version(), "pages": {"page0.html": "a", "page1.html": "b",
+                                                                      "page2.html": "c"}}
+        page_hashes = {"page0.html": "a", "page1.html": "B", "page3.html": "d"}
+        self.assertEqual((["page1.html", "page3.html"], ["page2.html"]), get_changed_pages(page_hashes, manifest))
+        self.assertEqual(([], []), get_changed_pages({"page0.html": "a", "page1.html": "b", "page2.html": "c"},
+                                                     manifest))
+
+    def test_parser_version_change_reparses_every_page(self):
+        manifest = {"parser_version": get_parser_version(), "pages": {"page0.html": "a", "page2.html": "c"}}
+        page_hashes = {"page0.html": "a", "page1.html": "b"}
+        with mock.patch.object(incremental, "get_parser_version", return_value="99:0"):
+            self.assertEqual((["page0.html", "page1.html"], ["page2.html"]), get_changed_pages(page_hashes, manifest))
+        self.assertEqual((["page0.html", "page1.html"], []), get_changed_pages(page_hashes, {}))
+
+    def test_merge_games(self):
+        games = make_games([["Drink", "Roots", 4, 1, "page0.html", "1", 0],
+                            ["Minsk", "Capitals", 2, 2, "page0.html", "1", 1],
+                            ["Drink", "Minsk", 1, 0, "page1.html", "2", 0],
+                            ["Roots", "Capitals", 0, 3, "page2.html", "3", 0],
+                            ["Roots", "Minsk", 1, 1, "page2.html", None, None]])
+        # Post 1 now has a single game, post 3 has moved to page1.html and page2.html is gone
+        new_games = make_games([["Drink", "Roots", 4, 2, "page0.html", "1", 0],
+                                ["Roots", "Capitals", 0, 3, "page1.html", "3", 0]])
+        filepaths = ["page0.html", "page1.html"]
+        merged = merge_games(games, new_games, ["1", "3"], ["page0.html", "page1.html", "page2.html"], filepaths)
+        self.assertEqual([("Drink", "Roots", 4, 2, "page0.html"), ("Roots", "Capitals", 0, 3, "page1.html")],
+                         [tuple(g) for g in merged[["home_team", "away_team", "home_score", "away_score",
+                                                    "filepath"]].values])
+        # Games of posts that weren't parsed again are kept, in the order of their pages
+        merged = merge_games(games, new_games.iloc[:1], ["1"], ["page0.html"], filepaths + ["page2.html"])
+        self.assertEqual([("Drink", "Roots", "1"), ("Drink", "Minsk", "2"), ("Roots", "Capitals", "3"),
+                          ("Roots", "Minsk", None)],
+                         [tuple(g) for g in merged[["home_team", "away_team", "post_id"]].values])
+
+    def test_merged_games_match_a_full_run(self):
+        games = make_games([["Drink", "Roots", 4, 1, "page0.html", "1", 0],
+                            ["Minsk", "Capitals", 2, 2, "page0.html", "2", 0],
+                            ["Minsk", "Roots", 1, 0, "page0.html", "2", 1],
+                            ["Drink", "Minsk", 1, 0, "page1.html", "3", 0],
+                            ["Roots", "Capitals", 0, 3, "page2.html", "4", 0]])
+        # page1.html has changed and page10.html is new, which comes between page1.html and page2.html
+        new_games = make_games([["Drink", "Minsk", 1, 1, "page1.html", "3", 0],
+                                ["Roots", "Drink", 2, 0, "page1.html", "5", 0],
+                                ["Capitals", "Drink", 3, 3, "page10.html", "6", 0]])
+        filepaths = ["page0.html", "page1.html", "page10.html", "page2.html"]
+        merged = merge_games(games, new_games, ["3", "5", "6"], ["page1.html", "page10.html"], filepaths)
+        full_run = pd.concat([games.iloc[:3], new_games, games.iloc[4:]], ignore_index=True)
+        pd.testing.assert_frame_equal(full_run, merged)
@@ -0,0 +1,74 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from src.overlays import OverlayStack
+
+
+class TestOverlayStack(TestCase):
+
+    def setUp(self):
+        columns = ["home_team", "away_team", "home_score", "away_score", "season", "competition"]
+        self.games = pd.DataFrame([["Drink", "Roots", 2, 1, "2014/15", "league"],
+                                   ["Roots", "Drink", 0, 0, "2014/15", "league"],
+                                   ["Minsk", "Drink", 3, 1, "2014/15", "league"]], columns=columns)
+        missing_games = pd.DataFrame([["Drink", "Minsk", 1, 1, "2014/15", "league"],
+                                      ["Drink", "Minsk", 4, 0, "2015/16", "league"],
+                                      ["Minsk", "Roots", 4, 0, "2014/15", "cup"]], columns=columns)
+        corrected_games = pd.DataFrame([["Roots", "Drink", 5, np.nan, "2014/15", "league"],
+                                        ["Drink", "Minsk", 2, 2, "2014/15", "league"]], columns=columns)
+        void_games = pd.DataFrame([["Minsk", "Drink", "2014/15", "league"]],
+                                  columns=["home_team", "away_team", "season", "competition"])
+        self.overlays = OverlayStack(missing_games, corrected_games, void_games)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_apply(self):
+        games = self.overlays.apply("2014/15", self.games)
+        self.assertEqual([("Drink", "Roots", 2, 1, "base"), ("Roots", "Drink", 5, 0, "corrected"),
+                          ("Minsk", "Drink", 3, 1, "base"), ("Drink", "Minsk", 2, 2, "corrected")],
+                         [tuple(g) for g in games[["home_team", "away_team", "home_score", "away_score",
+                                                   "source_layer"]].values])
+
+    def test_remove_void(self):
+        games = self.overlays.remove_void(self.overlays.apply("2014/15", self.games))
+        self.assertNotIn(("Minsk", "Drink"), [tuple(g) for g in games[["home_team", "away_team"]].values])
+        self.assertEqual(3, len(games))
+
+    def test_void_games_match_on_common_columns(self):
+        games = pd.concat([self.games, self.games.assign(season="2015/16")], ignore_index=True)
+        games["date"] = pd.to_datetime(["2014-10-05", "2014-11-02", "2015-01-11", "2015-10-04", "2015-11-01",
+                                        "2016-01-10"])
+        # Only the meeting on the given date, but in every season when there's no season column
+        void_games = pd.DataFrame([["Drink", "Roots", "2015-10-04"], ["Roots", "Drink", "2099-01-01"]],
+                                  columns=["home_team", "away_team", "date"])
+        games = OverlayStack(self.games.iloc[:0], self.games.iloc[:0], void_games).remove_void(games)
+        self.assertEqual([0, 1, 2, 4, 5], games.index.to_list())
+        void_games = pd.DataFrame([["Minsk", "Drink"]], columns=["home_team", "away_team"])
+        games = OverlayStack(self.games.iloc[:0], self.games.iloc[:0], void_games).remove_void(games)
+        self.assertEqual([0, 1, 4], games.index.to_list())
+        with self.assertRaises(ValueError):
+            OverlayStack(self.games.iloc[:0], self.games.iloc[:0], pd.DataFrame([["x"]], columns=["team"])) \
+                .remove_void(games)
+
+    def test_void_games_with_blank_cells(self):
+        # As read from a CSV, the blank score turns the void games' scores into floats
+        path = os.path.join(self.tmp_dir.name, "void_games.csv")
+        with open(path, "w") as f:
+            f.write("home_team,away_team,home_score,away_score,season\n"
+                    "Drink,Roots,2,1,2014/15\n"
+                    "Minsk,Drink,3,,2014/15\n")
+        void_games = pd.read_csv(path)
+        games = self.games.assign(away_score=pd.array([1, 0, None], dtype="Int64"))
+        games = OverlayStack(self.games.iloc[:0], self.games.iloc[:0], void_games).remove_void(games)
+        self.assertEqual([1], games.index.to_list())
+
+    def test_season_without_overlays(self):
+        games = self.overlays.apply("2016/17", self.games.assign(season="2016/17"))
+        self.assertEqual(["base"] * 3, games["source_layer"].to_list())
+        self.assertEqual(3, len(self.overlays.remove_void(games)))
@@ -0,0 +1,76 @@
+import io
+from unittest import TestCase, mock
+from bs4 import BeautifulSoup
+
+from src import page
+from src.page import Page
+from src.page_scanner import scan_posts
+from src.post_cache import PostRecord
+
+
+PAGE_HTML = """<!DOCTYPE html>
+<html><head><script type="text/javascript">var x = "<div class='post-outer'>";</script></head>
+<body>
+<div class="date-outer">
+<h2 class="date-header"><span>Sunday, March 6, 2016</span></h2>
+<div class="date-posts">
+<div class="post-outer">
+<div class="post hentry uncustomized-post-template" itemprop="blogPost">
+<meta content="7840077952037923546" itemprop="postId"/>
+<h3 class="post-title entry-title" itemprop="name">Week Thirteen</h3>
+<div class="post-body entry-content">
+<!-- results -->
+Drink 4-1 Roots<br/>
+Goals: Drink: Ben &amp; Son, Thang; Roots: Baptiste<br>
+FC Th&#7889;ng Nh&#7845;t 1-1 Hanoi Capitals
+<table><tr><td>Team</td><td>P</td></tr><tr><td>Drink</td><td>13</td></tr></table>
+</div>
+</div>
+</div>
+<div class="post-outer">
+<div class="post hentry"><h3 class="post-title">Cup Draw</h3><div class="post-body">1. Minsk vs. Roots</div></div>
+</div>
+</div>
+</div>
+<div class="date-outer">
+<h2 class="date-header"><span>Saturday, February 27, 2016</span></h2>
+<div class="date-posts"><div class="post-outer"><div class="post">HSS 0 &#8211; Drink 7</div></div></div>
+</div>
+</body></html>"""
+
+
+class TestPageScanner(TestCase):
+
+    def _expected_posts(self):
+        soup = BeautifulSoup(PAGE_HTML, "html.parser")
+        expected = []
+        for date_outer in soup.find_all("div", class_="date-outer"):
+            date_header = list(list(date_outer.find_all("h2", class_="date-header")[0].children)[0].children)[0]
+            for post_outer in date_outer.find_all("div", class_="post-outer"):
+                expected.append((date_header, str(post_outer)))
+        return expected
+
+    def test_posts_match_whole_document_soup(self):
+        actual = [(date_header, str(BeautifulSoup(post_html, "html.parser").div))
+                  for date_header, post_html in scan_posts(PAGE_HTML)]
+        self.assertEqual(self._expected_posts(), actual)
+
+    def test_posts_split_across_chunks_match_whole_document_soup(self):
+        actual = [(date_header, str(BeautifulSoup(post_html, "html.parser").div))
+                  for date_header, post_html in scan_posts(io.StringIO(PAGE_HTML), chunk_size=7)]
+        self.assertEqual(self._expected_posts(), actual)
+
+    def test_bytes_are_decoded(self):
+        actual = [date_header for date_header, _ in scan_posts(PAGE_HTML.encode())]
+        self.assertEqual(["Sunday, March 6, 2016", "Sunday, March 6, 2016", "Saturday, February 27, 2016"], actual)
+
+    def test_posts_are_parsed_one_at_a_time(self):
+        blog_posts = []
+        with mock.patch.object(page, "BlogPost", wraps=page.BlogPost) as blog_post_class:
+            for blog_post in Page(None)._get_all_posts_inner(PAGE_HTML):
+                # The next post isn't parsed until this one is done with, and every earlier post's tree is released
+                self.assertEqual(len(blog_posts) + 1, blog_post_class.call_count)
+                self.assertEqual([None] * len(blog_posts), [bp.post_html for bp in blog_posts])
+                PostRecord.from_blog_post(blog_post)
+                blog_posts.append(blog_post)
+        self.assertEqual(3, len(blog_posts))
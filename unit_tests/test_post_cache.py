@@ -0,0 +1,125 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import requests
+
+from src import post_cache
+from src.async_fetch import AsyncFetcher
+from src.post_cache import PostCache, fetch_records, get_page_filepaths, load_records
+from unit_tests.stand_in_server import StandInServer, get_page_delay
+
+
+def make_page(title, result):
+    return f"""<!DOCTYPE html>
+<html><body>
+<div class="date-outer">
+<h2 class="date-header"><span>Sunday, March 6, 2016</span></h2>
+<div class="date-posts">
+<div class="post-outer">
+<div class="post hentry" itemprop="blogPost">
+<meta content="7840077952037923546" itemprop="postId"/>
+<h3 class="post-title entry-title" itemprop="name">{title}</h3>
+<div class="post-body entry-content">
+{result}<br/>
+</div>
+</div>
+</div>
+</div>
+</div>
+</body></html>"""
+
+
+def get_games(records):
+    return [(r.title, [(g.home_team, g.home_score, g.away_score, g.away_team) for g in r.games]) for r in records]
+
+
+class TestPostCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.page_dir = os.path.join(self.tmp_dir.name, "pages")
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        os.mkdir(self.page_dir)
+        self.post_cache = PostCache(self.cache_dir)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, filename, content):
+        path = os.path.join(self.page_dir, filename)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_cache_hit(self):
+        path = self.write("page0.html", make_page("Week 1", "Drink 4-1 Roots"))
+        records = self.post_cache.get_records(path)
+        self.assertEqual([("Week 1", [("Drink", 4, 1, "Roots")])], get_games(records))
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        with mock.patch.object(post_cache, "Page", side_effect=AssertionError("page parsed again")):
+            self.assertEqual(get_games(records), get_games(self.post_cache.get_records(path)))
+        # A page with the same content shares the entry but its records point at that page
+        other_path = self.write("page1.html", make_page("Week 1", "Drink 4-1 Roots"))
+        self.assertEqual([other_path], [r.filepath for r in self.post_cache.get_records(other_path)])
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_changed_content_is_parsed_again(self):
+        path = self.write("page0.html", make_page("Week 1", "Drink 4-1 Roots"))
+        self.post_cache.get_records(path)
+        self.write("page0.html", make_page("Week 1", "Drink 4-2 Roots"))
+        self.assertEqual([("Week 1", [("Drink", 4, 2, "Roots")])], get_games(self.post_cache.get_records(path)))
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_parser_version_change_is_parsed_again(self):
+        path = self.write("page0.html", make_page("Week 1", "Drink 4-1 Roots"))
+        self.post_cache.get_records(path)
+        with mock.patch.object(post_cache, "PARSER_VERSION", post_cache.PARSER_VERSION + 1), \
+                mock.patch.object(post_cache, "Page", wraps=post_cache.Page) as page:
+            self.assertEqual([("Week 1", [("Drink", 4, 1, "Roots")])], get_games(self.post_cache.get_records(path)))
+        page.assert_called_once_with(None, path)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+
+    def test_parser_version_follows_post_classification(self):
+        path = self.write("post_classification.yml", "skip: [Captains meeting]\n")
+        with mock.patch.object(post_cache, "CLASSIFICATION_PATH", path), \
+                mock.patch.object(post_cache, "get_file_hash", wraps=post_cache.get_file_hash) as get_file_hash:
+            parser_version = post_cache.get_parser_version()
+            self.assertEqual(parser_version, post_cache.get_parser_version())
+            get_file_hash.assert_called_once_with(path)
+            self.write("post_classification.yml", "skip: [Captains meeting, HIFL Cup Draw]\n")
+            # Make sure the modification time moves on, however coarse the file system's clock
+            os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+            self.assertNotEqual(parser_version, post_cache.get_parser_version())
+
+    def test_get_page_filepaths(self):
+        for filename in ["page2.html", "page10.html", "page1.html", "manifest.json", "page3.html.tmp"]:
+            self.write(filename, "")
+        self.assertEqual([os.path.join(self.page_dir, f) for f in ["page1.html", "page10.html", "page2.html"]],
+                         get_page_filepaths(self.page_dir))
+
+    def test_parallel_load_matches_serial(self):
+        filepaths = [self.write(f"page{i}.html", make_page(f"Week {i}", f"Drink {i}-1 Roots")) for i in range(6)]
+        serial = [(filepath, get_games(records)) for filepath, records in load_records(filepaths, 1, self.cache_dir)]
+        self.assertEqual([(filepath, [(f"Week {i}", [("Drink", i, 1, "Roots")])])
+                          for i, filepath in enumerate(filepaths)], serial)
+        # Once with every page parsed by the workers and once with every page read from the cache
+        for cache_dir in [os.path.join(self.tmp_dir.name, "parallel_cache"), self.cache_dir]:
+            self.assertEqual(serial, [(filepath, get_games(records))
+                                      for filepath, records in load_records(filepaths, 2, cache_dir)])
+
+    def test_fetch_records(self):
+        server = StandInServer({f"/page/{i}": make_page(f"Week {i}", f"Drink {i}-1 Roots") for i in range(1, 5)},
+                               delay=get_page_delay).start()
+        self.addCleanup(server.stop)
+        server.failing.add("/page/2")
+        urls = [f"{server.base_url}/page/{i}" for i in range(1, 5)]
+        for workers in [1, 2]:
+            fetcher = AsyncFetcher(concurrency=4, rate_per_host=None, retries=1, backoff=0.01, timeout=5,
+                                   session=requests.Session())
+            page_records = fetch_records(urls, workers, fetcher)
+            # Pages come back in URL order though the later ones arrive first, each parsed like a saved page
+            self.assertEqual([(url, [(f"Week {i}", [("Drink", i, 1, "Roots")])])
+                              for i, url in enumerate(urls, 1)],
+                             [(url, get_games(records)) for url, records in page_records])
+            self.assertEqual(["7840077952037923546"] * 4, [records[0].post_id for _, records in page_records])
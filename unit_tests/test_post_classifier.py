@@ -0,0 +1,62 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from bs4 import BeautifulSoup
+
+from src.blog_post import BlogPost
+from src.post_classifier import SKIP, PostClassifier, load_classifier
+
+
+def make_post(title):
+    post_html = BeautifulSoup(f"""
+<div class="post-outer">
+<h3 class="post-title entry-title" itemprop="name">
+<a href="http://hanoiinternationalfootballleague.blogspot.com/2012/10/post.html">{title}</a>
+</h3>
+<div class="post-body entry-content">
+Drink Team 2 - 1 Roots
+</div>
+</div>""", "html.parser").div
+    return BlogPost("", "", post_html, "", "")
+
+
+class TestPostClassifier(TestCase):
+
+    def setUp(self):
+        self.classifier = PostClassifier(["HIFL Cup Draw", "Captains meeting"],
+                                         {"cup": ["cup"], "cup_draw": ["(?=.*cup).*draw"], "final": ["final", "last"]})
+
+    def test_classify(self):
+        self.assertEqual({SKIP, "cup", "cup_draw"}, self.classifier.classify("HIFL Cup Draw"))
+        self.assertEqual({"cup", "cup_draw"}, self.classifier.classify("Draw for the CUP"))
+        self.assertEqual({"cup", "final"}, self.classifier.classify("Cup Final"))
+        self.assertEqual({SKIP}, self.classifier.classify("Captains meeting"))
+        self.assertEqual(set(), self.classifier.classify("Captains meeting 2"))
+        self.assertEqual(set(), self.classifier.classify(None))
+
+    def test_shipped_classification(self):
+        classifier = load_classifier()
+        self.assertTrue(classifier.is_skipped("FC Thống Nhất Champion!"))
+        self.assertEqual({SKIP, "cup", "cup_draw"}, classifier.classify("HIFL 2012-13 Cup Draw"))
+        self.assertEqual({"cup"}, classifier.classify("Week 5 - Cup and league"))
+
+    def test_invalid_classification(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "post_classification.yml")
+            for content in ["skip: Catch Up Calendar\n", "categories:\n  cup draw: [cup]\n",
+                            "categories:\n  cup: [\"cup(\"]\n", "categories:\n  skip: [cup]\n"]:
+                with open(path, "w") as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    load_classifier(path)
+
+    def test_skipped_post_is_not_converted_to_text(self):
+        blog_post = make_post("Captains meeting").prepare()
+        self.assertTrue(blog_post.is_unneeded_post)
+        self.assertEqual(0, blog_post.html_text_uses)
+        blog_post = make_post("Week 2").prepare(False)
+        self.assertEqual("Week 2", blog_post.title)
+        self.assertFalse(blog_post.is_unneeded_post)
+        self.assertEqual([("Drink Team", 2, 1, "Roots")],
+                         [(g.home_team, g.home_score, g.away_score, g.away_team) for g in blog_post.games])
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from src.reconciliation import reconcile_season
+from src.standings import get_standings, get_standings_snapshots
+
+
+class TestReconciliation(TestCase):
+
+    def setUp(self):
+        self.teams = ["Drink", "Roots"]
+        self.games = pd.DataFrame([["Drink", "Roots", 2, 1, "2015-01-01"], ["Roots", "Drink", 0, 0, "2015-01-08"]],
+                                  columns=["home_team", "away_team", "home_score", "away_score", "date"])
+        self.final_table = pd.DataFrame([[1, "Drink", 2, 1, 1, 0, 2, 1, 1, 4],
+                                         [2, "Roots\xa0FC", 2, 0, 1, 1, 1, 2, -1, 1]],
+                                        columns=["Rank", "Team", "Played", "Won", "Draw", "Loss", "GF", "GA",
+                                                 "Goal difference", "Points"])
+
+    def test_matching_tables(self):
+        report = reconcile_season("2014/15", get_standings(self.teams, self.games), self.final_table,
+                                  {"Roots FC": "Roots"})
+        self.assertTrue(report.empty)
+
+    def test_discrepancies(self):
+        self.final_table.loc[0, "GF"] = 3
+        report = reconcile_season("2014/15", get_standings(self.teams, self.games), self.final_table)
+        # Roots FC isn't mapped to Roots, so every column of both differs
+        self.assertEqual([("Drink", "F", 2, 3, -1)],
+                         [tuple(r) for r in report.loc[report["Team"] == "Drink",
+                                                       ["Team", "column", "computed", "published", "difference"]]
+                          .values])
+        self.assertEqual(16, len(report[report["Team"].isin(["Roots", "Roots FC"])]))
+
+    def test_weekly_tables(self):
+        week_1 = pd.DataFrame([["Drink", 1, 1, 0, 0, 2, 1, 1, 3], ["Roots", 1, 0, 0, 1, 1, 2, -1, 1]],
+                              columns=["Team", "P", "W", "D", "L", "F", "A", "GD", "Pts"])
+        week_0 = week_1.assign(P=0, W=0, L=0, F=0, A=0, GD=0, Pts=0)
+        report = reconcile_season("2014/15", get_standings(self.teams, self.games), self.final_table,
+                                  {"Roots FC": "Roots"}, get_standings_snapshots(self.teams, self.games),
+                                  [("2014-12-25", "Week 0", week_0), ("2015-01-03", "Week 1", week_1)])
+        self.assertEqual([("weekly", "Week 1", "Roots", "Pts", 0, 1)],
+                         [tuple(r) for r in report[["table", "post_title", "Team", "column", "computed",
+                                                    "published"]].values])
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+import pandas as pd
+
+from src.reconstruction_jobs import ReconstructionJob, get_job_fingerprint, load_jobs, run_job, select_job_posts
+
+
+def make_post(title, rows, season="2014/15"):
+    table = pd.DataFrame(rows, columns=["Team", "P", "W", "D", "L", "F", "A", "GD", "Pts"])
+    return SimpleNamespace(table=table, title=title, date=title, season=season, filepath="", post_id=title, games=[],
+                           is_unneeded_post=False)
+
+
+class TestReconstructionJobs(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.week_1 = make_post("Week 1", [["Drink", 0, 0, 0, 0, 0, 0, 0, 0], ["Roots", 0, 0, 0, 0, 0, 0, 0, 0]])
+        self.week_2 = make_post("Week 2 - Drink win", [["Drink", 1, 1, 0, 0, 2, 1, 1, 3],
+                                                       ["Roots", 1, 0, 0, 1, 1, 2, -1, 0]])
+        self.job = ReconstructionJob("opening_weeks", "2014/15", ("Week 1", "Week 2 - Drink win"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, content):
+        path = os.path.join(self.tmp_dir.name, "reconstruction_jobs.yml")
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_load_jobs(self):
+        jobs = load_jobs()
+        self.assertEqual([True, False], [job.include_first for job in jobs])
+        path = self.write("- name: start\n  season: 2014/15\n  mode: exact\n  titles: [Position, Week 2]\n")
+        self.assertEqual((ReconstructionJob("start", "2014/15", ("Position", "Week 2"), False, "exact"),),
+                         load_jobs(path))
+
+    def test_invalid_jobs(self):
+        for content in ["- name: start\n  season: 2014/15\n",
+                        "- name: start\n  season: 2014/15\n  titles: [Position]\n  mode: best\n",
+                        "- name: start/end\n  season: 2014/15\n  titles: [Position]\n",
+                        "- name: start\n  season: 2014/15\n  titles: [Position]\n  first: true\n"]:
+            with self.assertRaises(ValueError):
+                load_jobs(self.write(content))
+
+    def test_posts_are_picked_as_they_pass(self):
+        other_season = make_post("Week 1", self.week_1.table.values, "2015/16")
+        without_table = make_post("Week 1", [])
+        without_table.table = None
+        job_posts = [[]]
+        posts = list(select_job_posts([self.week_1, other_season, without_table, self.week_2], [self.job], job_posts))
+        self.assertEqual(4, len(posts))
+        self.assertEqual([[self.week_1, self.week_2]], job_posts)
+        self.assertEqual(get_job_fingerprint(self.job, [self.week_1, self.week_2], "greedy"),
+                         get_job_fingerprint(self.job, job_posts[0], "greedy"))
+
+    def test_titles_are_matched_exactly(self):
+        job = ReconstructionJob("opening_weeks", "2014/15", ("Week 2 - Two perfect records survive.", "Week (3)?"))
+        posts = [make_post(title, self.week_1.table.values) for title in
+                 ["Week 2 - Two perfect records survive.", "Week 2 - Two perfect records survive!", "Week (3)?",
+                  "Week 3", "Week 2"]]
+        self.assertEqual([True, False, True, False, False], [job.picks(post) for post in posts])
+
+    def test_run_job(self):
+        games = run_job(self.job, [self.week_1, self.week_2], "greedy")
+        self.assertEqual([("Drink", "Roots", 2, 1)],
+                         [tuple(g) for g in games[["home_team", "away_team", "home_score", "away_score"]].values])
+        self.assertIn("confidence", run_job(self.job._replace(mode="exact"), [self.week_1, self.week_2], "greedy"))
+
+    def test_fingerprint_follows_job_and_posts(self):
+        fingerprint = get_job_fingerprint(self.job, [self.week_1, self.week_2], "greedy")
+        self.assertEqual(fingerprint, get_job_fingerprint(self.job, [self.week_1, self.week_2], "greedy"))
+        self.assertNotEqual(fingerprint, get_job_fingerprint(self.job, [self.week_1, self.week_2], "exact"))
+        self.assertNotEqual(fingerprint, get_job_fingerprint(self.job._replace(include_first=True),
+                                                             [self.week_1, self.week_2], "greedy"))
+        self.week_2.table.loc[0, "F"] = 3
+        self.assertNotEqual(fingerprint, get_job_fingerprint(self.job, [self.week_1, self.week_2], "greedy"))
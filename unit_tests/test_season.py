@@ -91,3 +91,38 @@ class TestSeason(TestCase):
             "Brothers FC": ["Brothers FC", 'FC Brothers']
         }
         self.assertDictEqual(expected, result)
+
+    def test_fix_team_name_variation_keeps_own_name(self):
+        games = pd.DataFrame({"home_team": ["Drink Team", "Hanoi Drink"],
+                              "away_team": ["Hanoi Drink Team", "Capitals"]})
+        season = Season("test_season", pd.DataFrame({"Team": ["Drink Team", "Hanoi Drink Team", "Capitals"]}), games)
+        season.fix_team_name_variation()
+        self.assertEqual(["Drink Team", "Hanoi Drink Team"], season.games["home_team"].to_list())
+        self.assertEqual(["Hanoi Drink Team", "Capitals"], season.games["away_team"].to_list())
+
+    def test_fix_team_name_variation_strict(self):
+        final_table = pd.DataFrame({"Team": ["Drink Team", "Hanoi Drink Team", "Capitals"]})
+        games = pd.DataFrame({"home_team": ["Drink"], "away_team": ["Capitals"]})
+        with self.assertRaises(RuntimeError):
+            Season("test_season", final_table, games).fix_team_name_variation(strict=True)
+        # Drink Team fuzzy matches Hanoi Drink Team too but it's a team's own name
+        games = pd.DataFrame({"home_team": ["Drink Team"], "away_team": ["Hanoi Drink Team"]})
+        season = Season("test_season", final_table, games)
+        season.fix_team_name_variation(strict=True)
+        self.assertEqual([("Drink Team", "Hanoi Drink Team")],
+                         [tuple(g) for g in season.games[["home_team", "away_team"]].values])
+
+    def test_fix_duplicate_missing_games(self):
+        games = pd.DataFrame([["Drink", "Roots", 2, 1, "2015-01-01"], ["Roots", "Drink", 0, 0, "2015-02-01"],
+                              ["Drink", "Minsk", 1, 0, "2015-01-08"], ["Drink", "Minsk", 3, 1, "2015-03-01"],
+                              ["Roots", "Minsk", 1, 1, "2015-01-15"], ["Roots", "Minsk", 4, 0, "2015-03-08"],
+                              ["Minsk", "Roots", 2, 2, "2015-02-15"]],
+                             columns=["home_team", "away_team", "home_score", "away_score", "date"])
+        season = Season("test_season", pd.DataFrame({"Team": ["Drink", "Roots", "Minsk"]}), games)
+        season.fix_duplicate_missing_games()
+        result = season.games.sort_values(["home_team", "away_team"])
+        # The more recent Drink vs. Minsk is flipped as Minsk vs. Drink is missing, whereas Minsk vs. Roots was played
+        # so only the more recent Roots vs. Minsk is kept
+        self.assertEqual([("Drink", "Minsk", 1, 0), ("Drink", "Roots", 2, 1), ("Minsk", "Drink", 1, 3),
+                          ("Minsk", "Roots", 2, 2), ("Roots", "Drink", 0, 0), ("Roots", "Minsk", 4, 0)],
+                         [tuple(g) for g in result[["home_team", "away_team", "home_score", "away_score"]].values])
@@ -0,0 +1,51 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import requests
+
+from src.sheets import SheetFetcher
+from unit_tests.stand_in_server import StandInServer
+
+
+class TestSheetFetcher(TestCase):
+
+    def setUp(self):
+        # Embed URLs redirect to their sheet, and only the known sheet has a CSV export
+        self.server = StandInServer({"/spreadsheets/d/abc123/pubhtml": "", "/spreadsheets/d/unknown/pubhtml": "",
+                                     "/spreadsheets/d/abc123/gviz/tq?tqx=out:csv&gid=0":
+                                         "#,Team,W,Pts\n1,Drink Team,3,9\n2,Minsk,1,3\n"},
+                                    {f"/pub?key={key}": f"/spreadsheets/d/{key}/pubhtml"
+                                     for key in ["abc123", "unknown"]}).start()
+        self.addCleanup(self.server.stop)
+        self.base_url = self.server.base_url
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "sheets")
+        self.url = self.base_url + "/pub?key=abc123"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _fetcher(self, offline=False):
+        return SheetFetcher(self.cache_dir, offline, requests.Session(), 5, self.base_url + "/spreadsheets")
+
+    def test_sheet_is_downloaded_once(self):
+        table = self._fetcher().get_table(self.url)
+        self.assertEqual(["Drink Team", "Minsk"], table["Team"].to_list())
+        self.assertTrue(os.path.isfile(os.path.join(self.cache_dir, "abc123_0.csv")))
+        self.server.requests.clear()
+        self._fetcher().get_table(self.url)
+        self.assertEqual([], self.server.requests)
+
+    def test_offline_only_reads_saved_sheets(self):
+        with self.assertRaises(RuntimeError):
+            self._fetcher(offline=True).get_table(self.url)
+        self.assertEqual([], self.server.requests)
+        self._fetcher().get_table(self.url)
+        self.server.stop()
+        table = self._fetcher(offline=True).get_table(self.url)
+        self.assertEqual([3, 1], table["W"].to_list())
+
+    def test_missing_sheet(self):
+        with self.assertRaises(requests.HTTPError):
+            self._fetcher().get_table(self.base_url + "/pub?key=unknown")
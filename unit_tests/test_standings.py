@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from src.standings import get_standings, get_standings_snapshots
+
+
+class TestStandings(TestCase):
+
+    def setUp(self):
+        self.teams = ["Drink", "Roots", "Minsk"]
+        self.games = pd.DataFrame([["Drink", "Roots", 2, 1, "2015-01-01"], ["Minsk", "Drink", 0, 0, "2015-01-01"],
+                                   ["Roots", "Minsk", 3, 1, "2015-01-08"], ["Minsk", "Dropouts", 5, 0, "2015-01-08"]],
+                                  columns=["home_team", "away_team", "home_score", "away_score", "date"])
+
+    def test_get_standings(self):
+        table = get_standings(self.teams, self.games)
+        self.assertEqual([["Drink", 2, 1, 1, 0, 2, 1, 1, 4],
+                          ["Roots", 2, 1, 0, 1, 4, 3, 1, 3],
+                          ["Minsk", 2, 0, 1, 1, 1, 3, -2, 1]], table.values.tolist())
+
+    def test_get_standings_snapshots(self):
+        snapshots = get_standings_snapshots(self.teams, self.games)
+        first = snapshots[snapshots["date"] == "2015-01-01"].drop(columns="date")
+        last = snapshots[snapshots["date"] == "2015-01-08"].drop(columns="date").reset_index(drop=True)
+        self.assertEqual([["Drink", 2, 1, 1, 0, 2, 1, 1, 4],
+                          ["Roots", 1, 0, 0, 1, 1, 2, -1, 0],
+                          ["Minsk", 1, 0, 1, 0, 0, 0, 0, 1]], first.values.tolist())
+        pd.testing.assert_frame_equal(get_standings(self.teams, self.games), last)
+
+    def test_games_without_a_date_are_left_out_of_snapshots(self):
+        games = pd.concat([self.games, pd.DataFrame([["Drink", "Minsk", 4, 0, None]], columns=self.games.columns)],
+                          ignore_index=True)
+        with self.assertLogs("src.standings", "WARNING"):
+            snapshots = get_standings_snapshots(self.teams, games)
+        last = snapshots[snapshots["date"] == "2015-01-08"].drop(columns="date").reset_index(drop=True)
+        pd.testing.assert_frame_equal(get_standings(self.teams, self.games), last)
+        self.assertEqual(2, snapshots["date"].nunique())
+
+    def test_no_games(self):
+        games = self.games.iloc[:0]
+        self.assertEqual([0] * 8, get_standings(self.teams, games).iloc[0, 1:].tolist())
+        self.assertTrue(get_standings_snapshots(self.teams, games).empty)
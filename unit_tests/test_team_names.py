@@ -0,0 +1,63 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from src import team_names
+from src.team_names import TeamNameIndex
+
+
+class TestTeamNameIndex(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "team_names.json")
+        self.teams = ["Hanoi Drink Team", "Hanoi Capitals", "X-men"]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_match(self):
+        index = TeamNameIndex()
+        result = index.match("2015/16", self.teams, ["Drink Team", "Capitals", "X Men", "Dropouts FC"])
+        expected = {
+            "Drink Team": ["Hanoi Drink Team"],
+            "Capitals": ["Hanoi Capitals"],
+            "X Men": ["X-men"],
+            "Dropouts FC": []
+        }
+        self.assertDictEqual(expected, result)
+
+    def test_saved_aliases_are_not_matched_again(self):
+        index = TeamNameIndex(self.cache_path)
+        index.match("2015/16", self.teams, ["Drink Team", "Capitals"])
+        index.save()
+        index = TeamNameIndex(self.cache_path)
+        with patch("src.team_names.fuzz.partial_ratio") as partial_ratio:
+            result = index.match("2015/16", self.teams, ["Capitals", "Drink Team"])
+        partial_ratio.assert_not_called()
+        self.assertDictEqual({"Capitals": ["Hanoi Capitals"], "Drink Team": ["Hanoi Drink Team"]}, result)
+
+    def test_aliases_are_dropped_when_pseudonyms_change(self):
+        index = TeamNameIndex()
+        index.match("2015/16", self.teams, ["Drink Team"])
+        index.match("2015/16", self.teams, ["Capitals"], {"X-men": ["Ex Men"]})
+        self.assertEqual(["Capitals"], list(index.seasons["2015/16"]["aliases"]))
+
+    def test_match_without_shared_words(self):
+        index = TeamNameIndex()
+        result = index.match("2015/16", ["Brothers"], ["Brother:"])
+        self.assertDictEqual({"Brother:": ["Brothers"]}, result)
+
+    def test_string_matches_every_team_above_threshold(self):
+        index = TeamNameIndex()
+        result = index.match("2015/16", ["Hanoi Capitals", "Kapitals FC", "Drink Team"], ["Capitals"])
+        self.assertDictEqual({"Capitals": ["Hanoi Capitals", "Kapitals FC"]}, result)
+
+    def test_aliases_are_dropped_when_matcher_changes(self):
+        index = TeamNameIndex(self.cache_path)
+        index.match("2015/16", self.teams, ["Drink Team"])
+        index.save()
+        with patch.object(team_names, "MATCH_THRESHOLD", 90):
+            self.assertDictEqual({}, TeamNameIndex(self.cache_path).seasons)
+        self.assertEqual(["Drink Team"], list(TeamNameIndex(self.cache_path).seasons["2015/16"]["aliases"]))